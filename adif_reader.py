@@ -0,0 +1,199 @@
+############################################################################################
+#
+# adif_reader.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Streaming, memory-mapped ADIF reader.  The date/time tags of each record are
+# looked at first and only records inside the contest window are turned into dicts,
+# so memory scales with the contest rather than with the whole logbook.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import re
+import mmap
+import datetime
+
+############################################################################################
+
+TAG_RE        = re.compile(rb'<([A-Za-z0-9_]+):(\d+)(?::[A-Za-z])?>')
+EOH_RE        = re.compile(rb'<eoh>',re.IGNORECASE)
+EOR_RE        = re.compile(rb'<eor>',re.IGNORECASE)
+QSO_DATE_OFF  = re.compile(rb'<qso_date_off:(\d+)(?::[A-Za-z])?>',re.IGNORECASE)
+TIME_OFF      = re.compile(rb'<time_off:(\d+)(?::[A-Za-z])?>',re.IGNORECASE)
+QSO_DATE      = re.compile(rb'<qso_date:(\d+)(?::[A-Za-z])?>',re.IGNORECASE)
+TIME_ON       = re.compile(rb'<time_on:(\d+)(?::[A-Za-z])?>',re.IGNORECASE)
+CONTEST_ID    = re.compile(rb'<contest_id:(\d+)(?::[A-Za-z])?>',re.IGNORECASE)
+
+EPOCH0 = datetime.date(1970,1,1).toordinal()
+
+############################################################################################
+
+# Function to convert an ADIF date & time (YYYYMMDD, HHMM[SS]) to seconds since 1970
+def adif_epoch(date,time):
+    try:
+        days = datetime.date(int(date[0:4]),int(date[4:6]),int(date[6:8])).toordinal() - EPOCH0
+        secs = int(time[4:6]) if len(time)>=6 else 0
+        return days*86400 + int(time[0:2])*3600 + int(time[2:4])*60 + secs
+    except (ValueError,TypeError):
+        return None
+
+# Function to convert a datetime to seconds since 1970
+def datetime_epoch(dt):
+    if dt==None:
+        return None
+    return (dt.toordinal() - EPOCH0)*86400 + dt.hour*3600 + dt.minute*60 + dt.second
+
+# Function to check if the next thing after offset p is another tag (or the end of the record)
+def at_tag(mm,p,end):
+    while p<end and mm[p:p+1].isspace():
+        p+=1
+    return p>=end or mm[p:p+1]==b'<'
+
+# Function to pull out a tag value of length n starting at offset v0 - returns the value
+# & the offset just past it.  The length is supposed to be in characters but some
+# loggers count bytes.  The two only differ for non-ASCII values (names, QTHs, ...) -
+# we go with whichever one ends right before the next tag.
+def tag_text(mm,v0,n,end):
+    raw = mm[v0:min(v0+n,end)]
+    if raw.isascii():
+        return raw.decode('ascii'),v0+n
+    txt = mm[v0:min(v0+4*n,end)].decode('utf-8','surrogateescape')[:n]
+    raw2 = txt.encode('utf-8','surrogateescape')
+    if not at_tag(mm,v0+n,end) and at_tag(mm,v0+len(raw2),end):
+        raw = raw2
+    return raw.decode('utf-8','replace'),v0+len(raw)
+
+############################################################################################
+
+# Memory-mapped ADIF reader - iterate over it to get the records inside the window
+class ADIF_READER:
+
+    def __init__(self,fname,date0=None,date1=None,contest_id=None):
+        self.fname      = fname
+        self.t0         = datetime_epoch(date0)
+        self.t1         = datetime_epoch(date1)
+        if contest_id:
+            self.contest_id = contest_id.upper()
+        else:
+            self.contest_id = None
+
+        self.nrecs = 0                      # No. records scanned
+        self.nkept = 0                      # No. records returned
+        self.nlate = 0                      # No. records after the end of the window
+        self.pos   = 0                      # Offset just past the last complete record
+
+    # Returns the value of a single tag between start & end, or None if not there
+    def tag_value(self,mm,rx,start,end):
+        m = rx.search(mm,start,end)
+        if m:
+            txt,pos = tag_text(mm,m.end(),int(m.group(1)),end)
+            return txt
+        return None
+
+    # Time stamp of a record - same precedence as the window filter in cabrillo.py
+    def record_epoch(self,mm,start,end):
+        date = self.tag_value(mm,QSO_DATE_OFF,start,end)
+        if date!=None:
+            time = self.tag_value(mm,TIME_OFF,start,end)
+        else:
+            date = self.tag_value(mm,QSO_DATE,start,end)
+            time = self.tag_value(mm,TIME_ON,start,end)
+        if date==None or time==None:
+            return None
+        return adif_epoch(date,time)
+
+    # Generator over the extents of each record - yields (start,end,epoch)
+    def scan(self,mm,pos=0):
+        if pos==0:
+            m = EOH_RE.search(mm)
+            if m:
+                pos = m.end()
+        while True:
+            m = EOR_RE.search(mm,pos)
+            if not m:
+                break
+            yield pos,m.start(),self.record_epoch(mm,pos,m.start())
+            pos = m.end()
+            self.pos = pos
+
+    # Parse all of the tags of a single record into a dict
+    def parse(self,mm,start,end):
+        rec={}
+        pos=start
+        while True:
+            m = TAG_RE.search(mm,pos,end)
+            if not m:
+                break
+            rec[m.group(1).decode().lower()],pos = tag_text(mm,m.end(),int(m.group(2)),end)
+        return rec
+
+    # Check if a time stamp is inside the window
+    # Records without a usable date are passed on so the caller can complain about them
+    def in_window(self,epoch):
+        if epoch==None:
+            return True
+        if self.t0!=None and epoch<self.t0:
+            return False
+        if self.t1!=None and epoch>self.t1:
+            self.nlate+=1
+            return False
+        return True
+
+    # Check the contest id without parsing the whole record
+    def right_contest(self,mm,start,end):
+        if not self.contest_id:
+            return True
+        id = self.tag_value(mm,CONTEST_ID,start,end)
+        return id!=None and id.upper()==self.contest_id
+
+    # Function to move past all of the complete records already in the file -
+    # only records appended after this are returned by records(self.pos).
+    # The end of the file is searched for the last <eor>, a bigger piece each time.
+    def skip_to_end(self):
+        self.pos = 0
+        with open(self.fname,'rb') as f:
+            if os.fstat(f.fileno()).st_size==0:
+                return self.pos
+            with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as mm:
+                n     = len(mm)
+                chunk = 4096
+                while True:
+                    start = max(0,n-chunk)
+                    m = None
+                    for m in EOR_RE.finditer(mm,start):
+                        pass
+                    if m:
+                        self.pos = m.end()
+                        break
+                    if start==0:
+                        break
+                    chunk*=8
+        return self.pos
+
+    # Generator over records inside the window, starting at byte offset pos
+    def records(self,pos=0):
+        with open(self.fname,'rb') as f:
+            if os.fstat(f.fileno()).st_size==0:
+                return
+            with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as mm:
+                for start,end,epoch in self.scan(mm,pos):
+                    self.nrecs+=1
+                    if self.in_window(epoch) and self.right_contest(mm,start,end):
+                        self.nkept+=1
+                        yield self.parse(mm,start,end)
+
+    def __iter__(self):
+        return self.records()
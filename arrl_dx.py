@@ -23,7 +23,11 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
+from timestamps import cabrillo_date_time
+from exchanges import EXCHANGE_TRACKER
+from live import LIVE_QUERY
 from dx import Station, Spot, WWV, Comment, ChallengeData
+from station_cache import get_station,station_cache_report
 from pprint import pprint
 from utilities import reverse_cut_numbers
 
@@ -35,7 +39,7 @@ TRAP_ERRORS = True
 ############################################################################################
     
 # Scoring class for CQ WW - Inherits the base contest scoring class
-class ARRL_INTL_DX_SCORING(CONTEST_SCORING):
+class ARRL_INTL_DX_SCORING(CONTEST_SCORING,LIVE_QUERY):
  
     def __init__(self,P):
         # Determine which mode we are using
@@ -47,6 +51,13 @@ class ARRL_INTL_DX_SCORING(CONTEST_SCORING):
             MODE='SSB'
         
         CONTEST_SCORING.__init__(self,P,'ARRL-DX-'+MODE,MODE)
+
+        # History columns to load up front - only count_cwops uses the history
+        self.HIST_FIELDS = []
+
+        # What makes a QSO unique - see dupes.py
+        self.DUPE_RULES = {'key':('call','band')}
+        self.EXCHANGES  = EXCHANGE_TRACKER()
         print('ARRL Internation DX Scoring Init')
 
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
@@ -110,9 +121,8 @@ class ARRL_INTL_DX_SCORING(CONTEST_SCORING):
         #else:
         #    qth = ''
         
-        dx_station = Station(call)
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        dx_station = get_station(call)
+        date_off,time_off = cabrillo_date_time(rec)
 
         if not TRAP_ERRORS and '?' in qth:
             qth=qth.replace('?','')
@@ -168,10 +178,7 @@ class ARRL_INTL_DX_SCORING(CONTEST_SCORING):
 
         # Info for multi-qsos
         exch_in=str(rst_in)+' '+str(qth)
-        if call in self.EXCHANGES.keys():
-            self.EXCHANGES[call].append(exch_in)
-        else:
-            self.EXCHANGES[call]=[exch_in]
+        self.EXCHANGES.add(call,exch_in)
             
         # Count no. of CWops guys worked
         self.count_cwops(call,HIST,rec)
@@ -199,6 +206,41 @@ class ARRL_INTL_DX_SCORING(CONTEST_SCORING):
 
         return line
                         
+    # Batch scoring from the QSO table - see qso_table.py
+    def score_table(self,df):
+        from qso_table import scored_qsos,by_band
+        df=scored_qsos(df)
+        df=df.assign(points=np.where(df['country'].isin(['United States','Canada']),0,3))
+        dx=df[df['country'].fillna('')!='']
+
+        NQSOS  = by_band(df,'call',self.BANDS,'size')
+        POINTS = by_band(df,'points',self.BANDS)
+        MULTS  = by_band(dx,'country',self.BANDS,'nunique')
+        return {'nqsos':len(df),'points':sum(POINTS.values()),'mults':sum(MULTS.values()),
+                'NQSOS':NQSOS,'POINTS':POINTS,'MULTS':MULTS}
+
+    # Same totals from the QSO by QSO scoring
+    def reference_totals(self):
+        MULTS={b:len(self.dxccs[b]) for b in self.BANDS}
+        return {'nqsos':self.nqsos2,'points':self.total_points,'mults':sum(MULTS.values()),
+                'NQSOS':dict(self.NQSOS),'POINTS':dict(self.POINTS),'MULTS':MULTS}
+                        
+    # What a QSO would be worth - see live.py.  Power doesn't matter.
+    def qso_value(self,band,call,exch=None):
+        dx_station = get_station(call)
+        if dx_station.country in ['United States','Canada']:
+            qso_points=0
+        else:
+            qso_points=3
+        new_mults=[]
+        if dx_station.country and dx_station.country not in self.dxccs[band]:
+            new_mults.append(dx_station.country)
+        return qso_points,new_mults
+
+    # Total points & mults so far
+    def score_totals(self):
+        return self.total_points,sum([len(self.dxccs[b]) for b in self.BANDS])
+                        
     # Summary & final tally
     def summary(self):
 
@@ -241,4 +283,6 @@ class ARRL_INTL_DX_SCORING(CONTEST_SCORING):
               int( (100.*self.num_running)/self.nqsos1+0.5),'%')
         print('No. QSOs S&P      =',self.num_sandp,' =',
               int( (100.*self.num_sandp)/self.nqsos1+0.5),'%')
+
+        station_cache_report()
         
@@ -0,0 +1,127 @@
+############################################################################################
+#
+# bktree.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# BK-tree of calls for finding busted calls.  All of the calls within a given edit
+# (Levenshtein) distance of a call are found without comparing against every call
+# in the history & log.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+from Levenshtein import distance
+
+############################################################################################
+
+MAX_DIST = 2                        # Max. edit distance for similar calls
+
+############################################################################################
+
+# BK-tree - each node is [word,{distance:child node}]
+class BK_TREE:
+
+    def __init__(self,words=[]):
+        self.root = None
+        self.n    = 0
+        for w in words:
+            self.add(w)
+
+    # Add a word to the tree
+    def add(self,word):
+        if self.root==None:
+            self.root=[word,{}]
+            self.n=1
+            return
+        node=self.root
+        while True:
+            d=distance(word,node[0])
+            if d==0:
+                return
+            child=node[1].get(d)
+            if child==None:
+                node[1][d]=[word,{}]
+                self.n+=1
+                return
+            node=child
+
+    # Find all words within maxd of a word - returns list of (distance,word), closest first
+    def search(self,word,maxd=MAX_DIST):
+        matches=[]
+        if self.root==None:
+            return matches
+        stack=[self.root]
+        while stack:
+            w,children=stack.pop()
+            d=distance(word,w)
+            if d<=maxd:
+                matches.append( (d,w) )
+            for dc,child in children.items():
+                if d-maxd<=dc<=d+maxd:
+                    stack.append(child)
+        matches.sort()
+        return matches
+
+    def __len__(self):
+        return self.n
+
+############################################################################################
+
+# Similar call finder over the history and the calls in the log.
+# The tree is only built if it's actually used.
+class SIMILAR_CALLS:
+
+    def __init__(self,HIST,qsos):
+        self.HIST = HIST
+        self.qsos = qsos
+        self.tree = None
+        self.logged = None
+
+    # Function to build the tree
+    def build(self):
+        self.logged=set( rec['call'].upper() for rec in self.qsos )
+        self.tree=BK_TREE()
+        for call in sorted(self.logged):
+            self.tree.add(call)
+        if self.HIST:
+            for call in self.HIST:
+                self.tree.add(call)
+        print('SIMILAR CALLS - BK-tree built with',len(self.tree),'calls')
+
+    # Function to add a call that's just been logged
+    def add(self,call):
+        call=call.upper()
+        if self.tree!=None and call not in self.logged:
+            self.logged.add(call)
+            self.tree.add(call)
+
+    # Function to find calls that are close to a call
+    def similar(self,call,maxd=MAX_DIST):
+        if self.tree==None:
+            self.build()
+        call=call.upper()
+        return [(d,c) for d,c in self.tree.search(call,maxd) if c!=call]
+
+    # Function to print out the calls that are close to a call
+    def list_similar_calls(self,call,maxd=MAX_DIST):
+        matches=self.similar(call,maxd)
+        print('Similar calls to',call,':')
+        for d,c in matches:
+            where=[]
+            if c in self.logged:
+                where.append('log')
+            if self.HIST and c in self.HIST:
+                where.append('history')
+            print('\t%-10s\tdist=%d\t%s' % (c,d,' & '.join(where)))
+        return matches
@@ -43,15 +43,29 @@
 #
 ############################################################################################
 
+import time
+T0=time.perf_counter()
+
 import sys
 import os
 import datetime
 import argparse
 import numpy as np
-import matplotlib.pyplot as plt
+from pprint import pprint
 
-from load_history import load_history
+from history import read_history
 from fileio import *
+from ingest import read_log_files,merge_logs,BAD_DATE
+from timestamps import qso_epochs
+from rates import QSO_RATES
+from offtime import OFF_TIME
+from qso_index import QSO_INDEX
+from bktree import SIMILAR_CALLS
+from dupes import DUPE_CHECKER
+from live import query_loop
+from station_cache import load_dx_cty
+from follow import LOG_FOLLOWER,follow_logs
+from exchanges import EXCHANGE_TRACKER
 from params import *
 
 #######################################################################################
@@ -163,12 +177,37 @@ def qso_time(rec):
     return dt
 
 
+
+# Function to import matplotlib - only done when we actually draw a plot
+def import_pyplot(P):
+    t0=time.perf_counter()
+    import matplotlib.pyplot as plt
+    if P.TIMING:
+        print('Import matplotlib:\t%8.3f sec' % (time.perf_counter()-t0))
+    return plt
+
+# Function to write a QSO line to the Cabrillo file, skipping exact duplicates.
+# The set gives an O(1) check while the file itself preserves the original order.
+def emit_line(fp,line):
+    global nsuppressed
+    if line in emitted:
+        if line:
+            print('@@@@@@@@@@@@@@@@@@@@@@@@ Duplicate line found\n',line)
+            print('@@@@@@@@@@@@@@@@@@@@@@@@    Line will be skipped')
+        nsuppressed+=1
+        return False
+    emitted.add(line)
+    fp.write('%s\n' % line)
+    return True
+
 #######################################################################################
 
 # Start of main
 print('\n****************************************************************************')
 print('\nCabrillo converter beginning ...')
+T1=time.perf_counter()
 P=PARAMS()
+T2=time.perf_counter()
 if True:
     print("P=")
     pprint(vars(P))
@@ -177,14 +216,19 @@ print('Start Date=',P.sc.date0)
 print('Stop Date =',P.sc.date1)
 print('\nInput file(s):',P.input_files)
 print('OUTPUT FILE=',P.output_file)
+if P.TIMING:
+    print('\nStart-up times:')
+    print('   Imports:\t\t%8.3f sec' % (T1-T0))
+    for module,dt in IMPORT_TIMES.items():
+        print('   Import %-10s\t%8.3f sec' % (module+':',dt))
+    print('   PARAMS:\t\t%8.3f sec' % (T2-T1))
 
 P.contest_name=P.sc.contest
 
 # Init
 istart  = -1
-cum_gap = 0
 if P.sc.contest=='ARRL 10': \
-    sc = ARRL_RTTY_RU_SCORING(contest)
+    sc = contest_class('ten')(contest)
 elif not P.sc:
     #sc = contest_scoring(contest)
     print('\nUnrecognized contest - aborting -',P.sc.contest,'\n')
@@ -194,75 +238,35 @@ elif not P.sc:
 #sys.exit(0)
 
 # Read adif input file(s)
-qsos2=[]
-for f in P.input_files:
-    fname=os.path.expanduser( f )
-    print('\nInput file:',fname)
-    
-    p,n,ext=parse_file_name(fname)
-    print('fname=',fname)
-    print('p=',p)
-    print('n=',n)
-    print('e=',ext)
-
-    if ext=='.LOG':
-        qsos1 = parse_simple_log(fname,args)
-    elif ext=='.csv':
-        print('Reading CSV file ...')
-        qsos1,hdr=read_csv_file(fname)
-    else:
-        qsos1 = parse_adif(fname)
-        #nflagged=parse_adif.nflagged
-    #print(qsos1)
-    #qsos.append(qsos1)
-    qsos2 = qsos2 + qsos1
-    #print qsos2
-    
-    #print(qsos1[0])
-    #print(qsos1[-1])
-    print("There are ",len(qsos1),len(qsos2)," QSOs")
-    #print('There were ',nflagged,' flags on the field')
+# Each log is filtered to the contest window and put in time order on its own,
+# then the logs are merged - needed if we merge multiple logs (e.g. for ARRL RTTY w/ FT8)
+if P.sc.contest[2:]=='-QSO-PARTY':
+    contest_id=P.sc.contest
+else:
+    contest_id=None
+fnames=[os.path.expanduser( f ) for f in P.input_files]
+positions={}
+try:
+    logs,nlate = read_log_files(fnames,P.sc.date0,P.sc.date1,contest_id,
+                                P.LOG_CACHE,P.PARALLEL,positions)
+except BAD_DATE as e:
+    print('\nHmmmmmmmmmm - cant figure out date!')
+    print(e.rec)
+    print(list(e.rec.keys()))
+    sys.exit(0)
+
+# Anything added to the logs after they were read is picked up in follow mode
+if P.FOLLOW:
+    follower = LOG_FOLLOWER(fnames,P.sc.date0,P.sc.date1,contest_id,positions)
 
 #sys.exit(0)
-    
-# Ignore entries outside contest window &
-# Sort list of QSOs by date/time - needed if we merge multiple logs (e.g. for ARRL RTTY w/ FT8
-qsos=[]
-nqsos=0
-first_time=True
-for rec in qsos2:
-    nqsos+=1
-    keys = list(rec.keys())
-    if len(keys)==0:
-        print('Skipping blank record')
-        print('\n',nqsos,rec)
-        continue
-    
-    if 'qso_date_off' in keys:
-        date_off = datetime.datetime.strptime( rec['qso_date_off']+" " + rec["time_off"] , "%Y%m%d %H%M%S")
-    elif 'qso_date' in keys:
-        date_off = datetime.datetime.strptime( rec['qso_date']+" " + rec["time_on"] , "%Y%m%d %H%M%S")
-    else:
-        print('\nHmmmmmmmmmm - cant figure out date!')
-        print(rec)
-        print(keys)
-        sys.exit(0)
-        
-    if date_off>=P.sc.date0 and date_off<=P.sc.date1:
-        rec["time_stamp"]=date_off
-        qsos.append(rec)
-    elif date_off>P.sc.date1:
-        if first_time:
-            print('\n***********************************************************************')
-            print('************ WARNING *** Extra QSO(s) found after contest end *********')
-            print('***********************************************************************\n')
-            first_time=False
-            if False:
-                print(rec)
-                print('date_off=',date_off,P.sc.date1)
-                sys.exit(0)
-        
-qsos.sort(key=lambda x: x['time_stamp'])
+
+if nlate>0:
+    print('\n***********************************************************************')
+    print('************ WARNING *** Extra QSO(s) found after contest end *********')
+    print('***********************************************************************\n')
+
+qsos=merge_logs(logs)
 
 # Open output file
 if False:
@@ -274,131 +278,74 @@ fp=open_output_file(P,P.output_file)
 
 # Load history file
 print('History file:',P.history,'\n')
-HIST,fname9 = load_history(P.history)
+HIST,fname9 = read_history(P.history,P.LOG_CACHE,getattr(P.sc,'HIST_FIELDS',None))
 #sys.exit(0)
 
+# Examine QSOs from a specific contest
+if P.sc.contest[2:]=='-QSO-PARTY':
+    qsos=[rec for rec in qsos if rec.get('contest_id','').upper()==P.sc.contest]
+
+# Index of QSOs by call for the scorers & busted call finder
+P.sc.qso_index = QSO_INDEX(qsos)
+P.sc.similar_calls = SIMILAR_CALLS(HIST,qsos)
+
+# QSO rates are computed for the whole contest at once
+epochs = qso_epochs(qsos)
+rates = QSO_RATES(epochs,[rec.get('mode','') for rec in qsos],P.sc.date0)
+if P.sc.contest=='Specific Call':
+    P.RATE_GRAPH=False
+
+# As are the off times & any operating time limit - NAQP has this (as do others)
+off = OFF_TIME(epochs,P.sc.date0,P.sc.date1,P.sc.min_time_gap)
+if P.sc.contest!='Specific Call':
+    off.print_gaps(qsos)
+    over_limit = off.over_limit(P.TIME_LIMIT)
+else:
+    over_limit = np.zeros(len(qsos),dtype=bool)
+if np.any(over_limit):
+    print('\nTime limit of',P.TIME_LIMIT,'hours reached at QSO',off.cutoff(P.TIME_LIMIT)+1)
+
+# Contests that declare their dupe rules use the hash table dupe checker
+if getattr(P.sc,'DUPE_RULES',None):
+    dupes = DUPE_CHECKER(P.sc.DUPE_RULES,P.sc)
+else:
+    dupes = None
+P.sc.dupe_checker = dupes
+
 # Loop over all qsos
-j=-1
-lines=[]
-times=[0]
-rates=[0]
-time_cw=[0]
-dts=[10*60]
-times5=[0]
-tlast=P.sc.date0
+emitted=set()
+nsuppressed=0
+dupe_flags=np.zeros(len(qsos),dtype=bool)
+scored=np.zeros(len(qsos),dtype=bool)
 nqsos=0
-op_time=0
 last_rec = None
-gap_min0 = 0
 for i in range(len(qsos)):
     rec=qsos[i]
     if i==0:
         print('\n',i,rec)
-    #date_off = datetime.datetime.strptime( rec["qso_date_off"]+" "+rec["time_off"] , "%Y%m%d %H%M%S")
     date_off = rec['time_stamp']
 
-    """
-    try:
-        if rec["contest_id"].upper()=='MAKROTHEN':
-            print('\n',i,rec)
-            print('date_off=',date_off,date_off>=P.sc.date0,date_off<=P.sc.date1)
-    except:
-        continue
-    """
-    
-    # Examine QSOs from a specific contest
-    if P.sc.contest[2:]=='-QSO-PARTY':
-        try:
-            id   = rec["contest_id"].upper()
-            if id!=P.sc.contest:
-                continue
-        except Exception as e: 
-            #print( str(e) )
-            #print('Skipping record rec=',rec)
-            #sys.exit(0)
-            continue
-
     # Ignore entries outside contest window - this is now done above so can eventually clean this up
     if date_off>=P.sc.date0 and date_off<=P.sc.date1:
         nqsos+=1
 
-        if False:
-            print(rec)
-            print(date0,' - ',date1,' ... ',date_off)
-            sys.exit(0)
-        
         if istart<0:
             istart=i
 
-        # Compute qso rate
-        if j<0:
+        if i==0:
 
-            # First QSO - init rate calcs
-            j=i
-            date_off2 = date_off
-            mins = 10
-            rate_window = datetime.timedelta(minutes=mins)
+            # First QSO
             t0 = date_off
             print('t0=',t0,'\n',nqsos,'\tFirst call=',rec['call'],'\t',rec['band'])
-
-            # Actual start time
-            gap_min0 = (date_off - P.sc.date0).total_seconds() / 60.0
-            cum_gap = gap_min0
-            print('Start time gap:',gap_min0,'minutes')
-            if False:
-                print('Date off=',date_off)
-                print('Date 0  =',date0)
-                sys.exit(0)
+            print('Start time gap:',off.start_gap,'minutes')
             
-        else:
-            while date_off2<date_off - rate_window:
-                j += 1
-                date_off2 = qsos[j]['time_stamp']
-            qrate = (i-j+1) / (mins/60.)
-            try:
-                df = float(rec['freq']) - float(qsos[i-1]['freq'])
-                t1 = rec['time_stamp']
-            except:
-                print('Problem with freq and/or time_stamp:')
-                print('rec=',rec)
-                sys.exit(0)
-                
-            if j==i:
-                gap_min = (date_off - qsos[i-1]['time_stamp']).total_seconds() / 60.0
-                if P.sc.contest!='Specific Call':
-                    print('\nTime gap:',gap_min,'minutes')
-                if gap_min>P.sc.min_time_gap:
-                    cum_gap += gap_min
-                    print('\n%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% Time Gap %%%%%%%%%%%%%%%%%%%%%%%%%%%%%')
-                    print(date_off,rec['call'],qsos[i-1]['call'])
-
-            #print('t1=',t1)
-            dt=(t1-t0).total_seconds() / 60.0
-            if P.sc.contest!='Specific Call':
-                op_time=( (t1 - P.sc.date0).total_seconds()/60.0 - cum_gap)/60.
-                if False:
-                    print(nqsos,'\t',op_time,'\tdt=',int(dt+.5),
-                          '\t\trate = ',qrate,' per hour\t\t',
-                          rec['call'],'\t',rec['mode'],'\t',
-                          rec['band'],'\t',df==0)
-                times.append(dt/60.)
-                rates.append(qrate)
-                if rec['mode']=='CW':
-                    time_cw.append(dt/60.)
-                else:
-                    time_cw.append(np.nan)
-
-        # Keep track of instantaneous rate as well
-        #if not rapid:
-        dt1=(date_off-P.sc.date0).total_seconds() / 3600.
-        times5.append(dt1)
-        dt2 = (date_off-tlast).total_seconds()
-        dts.append(dt2)
-        tlast = date_off
         last_rec = rec
         
         # Check for rapid dupes - this often happens with FT4/8
-        dupe,rapid = P.sc.check_dupes(rec,qsos,i,istart)
+        if dupes:
+            dupe,rapid = dupes.check(rec)
+        else:
+            dupe,rapid = P.sc.check_dupes(rec,qsos,i,istart)
         if rapid:
             if P.sc.contest!='FT8-RU' or False:
                 print('<<<<<<<<<<< RAPID dupe skipped >>>>>>>>>>>>>>\n')
@@ -407,10 +354,10 @@ for i in range(len(qsos)):
             else:
                 print('<<<<<<<<<<< RAPID ***NOT*** skipped for this contest >>>>>>>>>>>>>>\n')
 
-        # Check for operating time limit - NAQP has this (as do others)
-        if op_time>P.TIME_LIMIT:
+        # Check for operating time limit
+        if over_limit[i]:
             print('<<<<<<<<<<< Time limit exceeded >>>>>>>>>>>>>>',
-                  60*(op_time-P.TIME_LIMIT),'\t',rec['call'])
+                  60*(off.op_times[i]-P.TIME_LIMIT),'\t',rec['call'])
             P.sc.nskipped+=1
             dupe=True
             #continue
@@ -431,25 +378,20 @@ for i in range(len(qsos)):
             # This is how things should be for all contests
             # Added arg HIST2 for CQP
             #print('\nCABRILLO MAIN: rec=',rec,nqsos)
+            if isinstance(P.sc.EXCHANGES,EXCHANGE_TRACKER):
+                P.sc.EXCHANGES.set_qso(i)
+            dupe_flags[i]=dupe
+            scored[i]=True
             line = P.sc.qso_scoring(rec,dupe,qsos,HIST,P.sc.my_mode,P.HIST2)
             
         #print(line)
-        dupe=False
-        for L in lines:
-            if L==line:
-                if line:
-                    print('@@@@@@@@@@@@@@@@@@@@@@@@ Duplicate line found\n',line)
-                    print('@@@@@@@@@@@@@@@@@@@@@@@@    Line will be skipped')
-                dupe=True
-        if line!=None and not dupe:
+        if line!=None:
             # Some QSOs give multiple credits, e.g. State QP from a county line
             if type(line) is list:
                 for line1 in line:
-                    lines.append(line1)
-                    fp.write('%s\n' % line1)
+                    emit_line(fp,line1)
             else:
-                lines.append(line)
-                fp.write('%s\n' % line)
+                emit_line(fp,line)
 
 fp.write('END-OF-LOG:\n')
 fp.close()
@@ -457,12 +399,33 @@ if last_rec:
     print('\nLast call=',last_rec['call'],'\t',last_rec['band'])
 
 print(" ")
-P.sc.check_multis(qsos)
+if isinstance(P.sc.EXCHANGES,EXCHANGE_TRACKER):
+    # Exchanges were already checked as the QSOs were scored
+    P.sc.EXCHANGES.report()
+else:
+    # The libs do their own country lookups
+    load_dx_cty()
+    P.sc.check_multis(qsos)
 P.sc.summary()
+print('\nNo. duplicate lines suppressed =',nsuppressed)
+if dupes:
+    print('No. dupes =',dupes.ndupes,'\tNo. rapid dupes =',dupes.nrapid)
+
+# Check batch scoring from the QSO table against the above
+if P.QSO_TABLE:
+    if hasattr(P.sc,'score_table'):
+        from qso_table import qso_table,check_score_table
+        check_score_table(P.sc,qso_table(qsos,dupe_flags,scored))
+    else:
+        print('\nNo batch scoring for',P.sc.contest)
 print(" ")
 
+# What would the next QSO be worth? - see live.py
+if P.QUERY:
+    query_loop(P.sc)
+
 # Plot score vs time
-if len(P.sc.scores)>0 and True:
+if len(P.sc.scores)>0 and not P.FOLLOW:
     #print(P.sc.times)
     #print(P.sc.scores)
     if P.sc.times[-1]<2*60:
@@ -478,6 +441,7 @@ if len(P.sc.scores)>0 and True:
         sscale=.001
         lab2='(K)'
  
+    plt=import_pyplot(P)
     fig, ax = plt.subplots()
     times=tscale*np.array(P.sc.times)
     scores=sscale*np.array(P.sc.scores)
@@ -495,89 +459,38 @@ if len(P.sc.scores)>0 and True:
 
 
 # Actual stop time & average qso rate
-print('Start Date/Time:',P.sc.date0)
-print('End   Date/Time:',P.sc.date1)
-print('\nStart time gap:\t\t%8.1f minutes\t=%8.1f hours' % (gap_min0,gap_min0/60.) )
-gap_min = (P.sc.date1 - date_off).total_seconds() / 60.0
-cum_gap += gap_min
-print('Stop time gap:\t\t%8.1f minutes\t=%8.1f hours'  % (gap_min,gap_min/60.) )
-print('Total time off:\t\t%8.1f minutes\t=%8.1f hours' % (cum_gap, cum_gap/60.) )
-duration = (P.sc.date1 - P.sc.date0).total_seconds() / 60.0
-print('Contest duration:\t%8.1f minutes \t=%8.1f hours' %(duration,duration/60.) )
-op_time=duration-cum_gap
-hrs  = int(op_time/60)
-mins = int( op_time-60*hrs + 0.5 )
-print('Operating time:\t\t%8.1f minutes \t=%8.1f hours \t= %d:%d hours' %
-      (op_time,op_time/60.,hrs,mins) )
+off.report()
+op_time=off.op_time
 ave_rate = P.sc.nqsos2/(op_time/60.)
 print('Average rate:\t\t%8.1f per hour\n' % ave_rate)
 
 
-# Interpolate the rate data
-rate_inst=3600./np.array(dts)
-times2=[]
-rates2=[]
-tend=times[-1]
-print('tend=',tend)
-t=0
-dt=1./60.
-idx=0
-#print('times5=',times5,len(times5))
-while t<tend:
-    times2.append(t)
-    #print(t,idx)
-    while idx<len(times5) and times5[idx]<=t:
-        #r=rates[idx]
-        r=rate_inst[idx]
-        idx+=1
-    rates2.append(r)
-    t+=dt
-
-# Smooth out the data    
-if tend>3:
-    N=11
-    tscale=1.
-    lab='Hours'
-else:
-    N=11
-    tscale=60.
-    lab='Minutes'
-h=np.ones(N)/float(N)
-if len(rates2)>0:
-    rates5=np.array(rates2)
-    rates3=np.convolve(rates5,h,'same')
-else:
+# Rate report
+rates.report()
+if len(rates.rates3)==0:
     P.RATE_GRAPH=False
-
-times=np.array(times)
-time_cw=np.array(time_cw)
-times2=np.array(times2)
-times5=np.array(times5)
-
-#print('rate_inst=',rate_inst,len(rate_inst))
-#print('times =',times, len(times) )
-#print('times2=',times2,len(times2))
-#print('times5=',times5, len(times5) )
-#print('h=',h)
-#print('rates2=',rates2)
-#print('rates3=',rates3,len(rates3))
-#print('dts=',dts,len(dts))
     
 # Plot qso rate vs time
 if P.RATE_GRAPH:
+    plt=import_pyplot(P)
     fig, ax = plt.subplots()
-    ax.plot(tscale*times,rates,color='red',label='All Modes')
-    ax.plot(tscale*time_cw,rates,color='blue',label='CW')
-    #ax.plot(times2,rates2,color='green',label='Interp')
-    ax.plot(tscale*times5,rate_inst,color='cyan',label='Inst')
-    ax.plot(tscale*times2,rates3,color='orange',label='Smoothed')
-    ax.set_xlabel('Time from Start ('+lab+')')
+    tscale=rates.tscale
+    ax.plot(tscale*rates.times,rates.rates,color='red',label='All Modes')
+    ax.plot(tscale*rates.time_cw,rates.rates,color='blue',label='CW')
+    #ax.plot(rates.times2,rates.rates2,color='green',label='Interp')
+    ax.plot(tscale*rates.times5,rates.rate_inst,color='cyan',label='Inst')
+    ax.plot(tscale*rates.times2,rates.rates3,color='orange',label='Smoothed')
+    ax.set_xlabel('Time from Start ('+rates.lab+')')
     ax.set_ylabel('QSO Rate (per hour)')
     #fig.suptitle('QSO RATE')
     fig.suptitle(P.sc.contest)
     #ax.set_title('Starting at '+date1)
     ax.grid(True)    
-    plt.xlim(0,tend*tscale)
+    plt.xlim(0,rates.tend*tscale)
     plt.ylim(0,200)
     ax.legend(loc='upper left')
     plt.show()
+
+# Keep scoring new QSOs as they're logged - see follow.py
+if P.FOLLOW:
+    follow_logs(P,follower,qsos,HIST,dupes,max(istart,0),P.FOLLOW,off)
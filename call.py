@@ -23,6 +23,7 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
+from timestamps import cabrillo_date_time
 from dx.spot_processing import Station, Spot, WWV, Comment, ChallengeData
 from fileio import write_adif_record
 
@@ -68,10 +69,9 @@ class SPECIFIC_CALL(CONTEST_SCORING):
         if call in self.CALLS:
             self.nqsos2 += 1;
 
-            freq_khz = int( 1000*float(rec["freq"]) +0.5 )
+            freq_khz = rec.freq_khz
             mode     = rec["mode"].upper()
-            date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-            time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+            date_off,time_off = cabrillo_date_time(rec)
             if 'contest_id' in rec.keys():
                 contest_id=rec['contest_id']
             else:
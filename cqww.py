@@ -26,7 +26,12 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
+from timestamps import cabrillo_date_time
+from exchanges import EXCHANGE_TRACKER
+from mults import MULT_ARRAY
+from live import LIVE_QUERY
 from dx.spot_processing import Station, Spot, WWV, Comment, ChallengeData
+from station_cache import get_station,station_cache_report
 from pprint import pprint
 from utilities import reverse_cut_numbers
 
@@ -38,32 +43,32 @@ TRAP_ERRORS = True
 ############################################################################################
     
 # Scoring class for CQ WW - Inherits the base contest scoring class
-class CQ_WW_SCORING(CONTEST_SCORING):
+class CQ_WW_SCORING(CONTEST_SCORING,LIVE_QUERY):
  
     def __init__(self,P,MODE):
         CONTEST_SCORING.__init__(self,P,'CQ-WW-'+MODE,MODE)
+
+        # History columns to load up front - only count_cwops uses the history
+        self.HIST_FIELDS = []
+
+        # What makes a QSO unique - see dupes.py
+        self.DUPE_RULES = {'key':('call','band')}
+        self.EXCHANGES  = EXCHANGE_TRACKER()
         print('CQ WW Scoring Init')
 
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
-        mults  = []
-        states = []
-        zones  = []
-        dxccs  = []
         self.NQSOS = OrderedDict()
         self.POINTS = OrderedDict()
         self.NSTATES = OrderedDict()
         for b in self.BANDS:
-            mults.append((b,set([])))
-            states.append((b,set([])))
-            zones.append((b,set([])))
-            dxccs.append((b,set([])))
             self.NQSOS[b]=0
             self.POINTS[b]=0
             self.NSTATES[b]=0
-        self.mults = OrderedDict(mults)
-        self.states = OrderedDict(states)
-        self.zones = OrderedDict(zones)
-        self.dxccs = OrderedDict(dxccs)
+
+        # Mults worked on each band - zones, countries & (RTTY only) US states/Canadian provinces
+        self.zones  = MULT_ARRAY(self.BANDS,range(1,41))
+        self.dxccs  = MULT_ARRAY(self.BANDS,[],400)
+        self.states = MULT_ARRAY(self.BANDS,CQ_STATES)
         self.MY_CQ_ZONE = int( P.SETTINGS['MY_CQ_ZONE'] )
 
         # Point to proper scoring function
@@ -134,9 +139,8 @@ class CQ_WW_SCORING(CONTEST_SCORING):
         else:
             qth = ''
 
-        dx_station = Station(call)
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        dx_station = get_station(call)
+        date_off,time_off = cabrillo_date_time(rec)
 
         # Minor corrections
         if qth=='':
@@ -157,7 +161,7 @@ class CQ_WW_SCORING(CONTEST_SCORING):
 
         # Error checking
         if call not in ['CF2I','TO4A','FO/NX1P']:
-            if zone!=dx_station.cqz or zone<0 or zone>40:
+            if (dx_station.cqz!=None and zone!=dx_station.cqz) or zone<0 or zone>40:
                 print('*** Zone Mismatch ***')
                 print('call=',call)
                 print('zone=',zone,dx_station.cqz)
@@ -170,19 +174,13 @@ class CQ_WW_SCORING(CONTEST_SCORING):
         if not dupe:
             self.nqsos2 += 1;
             self.NQSOS[band]+=1
-            if dx_station.country=='United States':
-                qso_points=0
-            elif dx_station.continent=='NA':
-                qso_points=2
-            else:
-                qso_points=3
+            qso_points = self.station_points(dx_station)
             self.total_points += qso_points
             self.POINTS[band] += qso_points
 
-            self.mults[band].add(str(zone))
-            self.mults[band].add(dx_station.country)
-            self.zones[band].add(int(zone))
-            self.dxccs[band].add(dx_station.country)
+            self.zones.add(band,int(zone))
+            if dx_station.country:
+                self.dxccs.add(band,dx_station.country)
 
             #self.countries.add(dx_station.country)
             
@@ -199,10 +197,7 @@ class CQ_WW_SCORING(CONTEST_SCORING):
 
         # Info for multi-qsos
         exch_in=str(rst_in)+' '+str(zone)
-        if call in self.EXCHANGES.keys():
-            self.EXCHANGES[call].append(exch_in)
-        else:
-            self.EXCHANGES[call]=[exch_in]
+        self.EXCHANGES.add(call,exch_in)
             
         # Count no. of CWops guys worked
         self.count_cwops(call,HIST,rec)
@@ -324,9 +319,8 @@ class CQ_WW_SCORING(CONTEST_SCORING):
             problem=True
         """
 
-        dx_station = Station(call)
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        dx_station = get_station(call)
+        date_off,time_off = cabrillo_date_time(rec)
 
         if problem:
             print('\nrec=',rec)
@@ -365,7 +359,7 @@ class CQ_WW_SCORING(CONTEST_SCORING):
                 sys.exit(0)
         
         if ((state in STATES) and zone!=CQ_ZONES[state] ) or \
-           ( not (state in STATES) and zone!=dx_station.cqz):
+           ( not (state in STATES) and dx_station.cqz!=None and zone!=dx_station.cqz):
             print('*** Zone Mismatch ***')
             print('call=',call)
             print('zone=',zone,CQ_ZONES[state],dx_station.cqz )
@@ -394,32 +388,19 @@ class CQ_WW_SCORING(CONTEST_SCORING):
         if not dupe:
             self.nqsos2 += 1;
             self.NQSOS[band]+=1
-            if dx_station.country=='United States':
-                qso_points=1
-            elif dx_station.continent=='NA':
-                qso_points=2
-            else:
-                qso_points=3
+            qso_points = self.station_points(dx_station)
             self.total_points += qso_points
             self.POINTS[band] += qso_points
 
-            self.mults[band].add(str(zone))
-            self.mults[band].add(dx_station.country)
+            self.zones.add(band,int(zone))
             if state!='DX':
-                self.mults[band].add(state)
-                   
-            self.zones[band].add(str(zone))
-            #print(self.zones)
-            if dx_station.country in ['United States','Canada']:
-                self.states[band].add(state)
-            self.dxccs[band].add(dx_station.country)
+                self.states.add(band,state)
+            if dx_station.country:
+                self.dxccs.add(band,dx_station.country)
             
             # Info for multi-qsos
             exch_in=rst_in+' '+str(zone)+' '+state
-            if call in self.EXCHANGES.keys():
-                self.EXCHANGES[call].append(exch_in)
-            else:
-                self.EXCHANGES[call]=[exch_in]
+            self.EXCHANGES.add(call,exch_in)
                         
         # Count no. of CWops guys worked
         self.count_cwops(call,HIST,rec)
@@ -449,6 +430,93 @@ class CQ_WW_SCORING(CONTEST_SCORING):
 
         return line
                         
+    # Batch scoring from the QSO table - see qso_table.py
+    def score_table(self,df):
+        import pandas as pd
+        from qso_table import scored_qsos,by_band
+        df=scored_qsos(df)
+        dx  = ~df['country'].isin(['United States','Canada'])
+        if self.qso_scoring==self.qso_scoring_cw:
+            zone=pd.to_numeric(df['qth'].replace('AK','1'),errors='coerce')
+            zone=zone.fillna(df['cqz'].astype(float))
+            state=pd.Series('DX',index=df.index)
+            us_pts=0
+        else:
+            srx=df['srx_string'].fillna('').str.split(',')
+            zone=pd.to_numeric(srx.str[1],errors='coerce')
+            state=srx.str[2].fillna('').where(~dx,'DX')
+            us_pts=1
+
+        # QSOs we can't get a zone for are left out - the totals will differ
+        bad=zone.isna()
+        if bad.any():
+            print('\nCQ WW - Unable to get zone for',int(bad.sum()),'QSO(s) in the QSO table:')
+            for call,srx_string,qth in zip(df['call'][bad],df['srx_string'][bad],df['qth'][bad]):
+                print('   ',call,'\tsrx=',srx_string,'\tqth=',qth)
+            df,zone,state = df[~bad],zone[~bad],state[~bad]
+
+        us  = df['country']=='United States'
+        na  = df['continent']=='NA'
+        df=df.assign(points=np.where(us,us_pts,np.where(na,2,3)),
+                     zone=zone.astype(int).astype(str),state=state)
+
+        NQSOS  = by_band(df,'call',self.BANDS,'size')
+        POINTS = by_band(df,'points',self.BANDS)
+        nzones = by_band(df,'zone',self.BANDS,'nunique')
+        ndxccs = by_band(df[df['country'].fillna('')!=''],'country',self.BANDS,'nunique')
+        nstates= by_band(df[df['state']!='DX'],'state',self.BANDS,'nunique')
+        MULTS  = {b:nzones[b]+ndxccs[b]+nstates[b] for b in self.BANDS}
+        return {'nqsos':len(df),'points':sum(POINTS.values()),'mults':sum(MULTS.values()),
+                'NQSOS':NQSOS,'POINTS':POINTS,'MULTS':MULTS}
+
+    # Same totals from the QSO by QSO scoring
+    def reference_totals(self):
+        MULTS={b:self.mults(b) for b in self.BANDS}
+        return {'nqsos':self.nqsos2,'points':self.total_points,'mults':sum(MULTS.values()),
+                'NQSOS':dict(self.NQSOS),'POINTS':dict(self.POINTS),'MULTS':MULTS}
+                        
+    # No. of mults on a band
+    def mults(self,band):
+        return self.zones.count(band) + self.dxccs.count(band) + self.states.count(band)
+
+    # QSO points for a station - US stations count on RTTY only
+    def station_points(self,dx_station):
+        if dx_station.country=='United States':
+            if self.qso_scoring==self.qso_scoring_cw:
+                return 0
+            return 1
+        elif dx_station.continent=='NA':
+            return 2
+        else:
+            return 3
+
+    # What a QSO would be worth - see live.py.  exch is the zone, plus the
+    # state/province on RTTY, e.g. '5 NY'
+    def qso_value(self,band,call,exch=None):
+        dx_station = get_station(call)
+        zone  = dx_station.cqz
+        state = None
+        if exch:
+            for x in exch.replace(',',' ').upper().split():
+                if x.isdigit():
+                    zone=int(x)
+                elif x in CQ_STATES:
+                    state=x
+
+        new_mults=[]
+        if zone and self.zones.is_new(band,int(zone)):
+            new_mults.append('Zone '+str(int(zone)))
+        if dx_station.country and self.dxccs.is_new(band,dx_station.country):
+            new_mults.append(dx_station.country)
+        if self.qso_scoring==self.qso_scoring_rtty and state and \
+           dx_station.country in ['United States','Canada'] and self.states.is_new(band,state):
+            new_mults.append(state)
+        return self.station_points(dx_station),new_mults
+
+    # Total points & mults so far
+    def score_totals(self):
+        return self.total_points,sum([self.mults(b) for b in self.BANDS])
+
     # Summary & final tally
     def summary(self):
 
@@ -460,66 +528,36 @@ class CQ_WW_SCORING(CONTEST_SCORING):
             print('   ',dxcc[i])
         """
 
-        print('\nZones:')
-        print(self.zones)
-
         print('nqsos2=',self.nqsos2)
         print('num warnings=',self.warnings)
 
-        #print('MULTS:',self.mults)
-        mults=0
-        nstates=0
-        nzones=0
-        ndxccs=0
         nqsos3=0
-        dxccs=[]
-        zones=[]
         for b in self.BANDS:
             print('\n',b,'# QSOs=',self.NQSOS[b])
             nqsos3+=self.NQSOS[b]
-            
-            m = list( self.mults[b] )
-            m.sort()
-            print(b,' Mults:',m,len(m))
-            mults+=len(m)
-
-            s = list( self.states[b] )
-            s.sort()
-            print(b,' States:',s,len(s))
-            nstates+=len(s)
-            self.NSTATES[b]=len(s)
-            
-            d = list( self.dxccs[b] )
-            d.sort()
-            print(b,' DXCCs :',d,len(d))
-            ndxccs+=len(d)
-            dxccs+=d
-
-            z = list( self.zones[b] )
-            z.sort()
-            print(b,' Zones :',z,len(z))
-            nzones+=len(z)
-            zones+=z
-
+            print(b,' Mults:',self.mults(b))
+            print(b,' States:',self.states.worked_keys(b),self.states.count(b))
+            print(b,' DXCCs :',self.dxccs.worked_keys(b),self.dxccs.count(b))
+            print(b,' Zones :',self.zones.worked_keys(b),self.zones.count(b))
+            self.NSTATES[b]=self.states.count(b)
+
+        nstates=self.states.total()
+        nzones =self.zones.total()
+        ndxccs =self.dxccs.total()
+        mults  =nstates+nzones+ndxccs
         print('\nBand\tQSOs\tPoints\tStates\tZones\tDXCCs')
         for b in self.BANDS:
             print(b,'\t',self.NQSOS[b],'\t',self.POINTS[b],'\t',self.NSTATES[b],
-                  '\t',len( self.zones[b] ),'\t',len( self.dxccs[b] ))
+                  '\t',self.zones.count(b),'\t',self.dxccs.count(b))
         print('\nTotals:\t',nqsos3,'\t',self.total_points,'\t',nstates,'\t',nzones,'\t',ndxccs)
 
         print('\nClaimed score =',self.total_points*mults)
 
-        zones=list(set(zones)) 
-        zones.sort()
-        print('\nNo. unique Zones =',len(zones))
-        print(zones)
+        print('\nNo. unique Zones =',self.zones.unique())
+        print(self.zones.worked_keys())
         
-        dxccs=list(set(dxccs)) 
-        dxccs.sort()
-        print('\nNo. unique DXCCs =',len(dxccs))
-        print(dxccs)
-        #for i in range(len(dxccs)):
-        #    print('   ',dxccs[i])
+        print('\nNo. unique DXCCs =',self.dxccs.unique())
+        print(self.dxccs.worked_keys())
 
         print('\n# CWops Members =',self.num_cwops,' =',
               int( (100.*self.num_cwops)/self.nqsos1+0.5),'%')
@@ -527,6 +565,8 @@ class CQ_WW_SCORING(CONTEST_SCORING):
               int( (100.*self.num_running)/self.nqsos1+0.5),'%')
         print('# QSOs S&P      =',self.num_sandp,' =',
               int( (100.*self.num_sandp)/self.nqsos1+0.5),'%')
+
+        station_cache_report()
         
         """
         print('\nnqsos         =',self.nqsos2,nqsos3)
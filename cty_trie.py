@@ -0,0 +1,213 @@
+############################################################################################
+#
+# cty_trie.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Longest-prefix-match trie built from cty.dat, including the exact-call overrides.
+# The trie is built once and saved as a binary snapshot next to cty.dat.  The
+# snapshot is rebuilt whenever cty.dat changes.
+#
+# cty.dat format - see https://www.country-files.com/cty-dat-format/ :
+#
+#   Country:  CQ Zone:  ITU Zone:  Continent:  Lat:  Lon (+W):  UTC offset:  Prefix:
+#       prefix,prefix,=exactcall,prefix(cqz)[ituz]<lat/lon>{cont}~tz~,...;
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import re
+import pickle
+
+############################################################################################
+
+SNAPSHOT_VERSION = 1
+CTY_FILES        = ['cty.dat','wl_cty.dat']
+
+# Things that get tacked onto the end of a call but don't change the country
+SUFFIXES = ['P','M','MM','AM','QRP','A','B','LH','R','T','J','Q']
+
+# Maritime & aeronautical mobile - these stations aren't in any country
+NO_COUNTRY = ['MM','AM']
+
+OVERRIDE_RE = re.compile(r'\((\d+)\)|\[(\d+)\]|<([^/>]+)/([^>]+)>|\{(\w+)\}|~([^~]+)~')
+
+############################################################################################
+
+# Function to figure out the home call of a portable call, e.g. KH6/W1AW/P -> W1AW
+def homecall(call):
+    parts=[p for p in call.upper().split('/') if p and p not in SUFFIXES]
+    if len(parts)==0:
+        return call.upper()
+    return max(parts,key=len)
+
+############################################################################################
+
+# Resolved station info - same attribute names as dx.spot_processing.Station
+class CTY_STATION:
+
+    def __init__(self,call,homecall,prefix,entry):
+        self.call      = call
+        self.homecall  = homecall
+        self.prefix    = prefix
+        if entry:
+            self.country   = entry[0]
+            self.cqz       = entry[1]
+            self.ituz      = entry[2]
+            self.continent = entry[3]
+            self.latitude  = entry[4]
+            self.longitude = entry[5]
+        else:
+            self.country   = None
+            self.cqz       = None
+            self.ituz      = None
+            self.continent = None
+            self.latitude  = None
+            self.longitude = None
+
+############################################################################################
+
+# Longest-prefix-match trie of cty.dat - each node is a dict keyed by the next
+# character, the entry for a prefix that ends at a node is stored under key ''.
+class CTY_TRIE:
+
+    def __init__(self):
+        self.root   = {}
+        self.exact  = {}
+        self.nprefixes = 0
+
+    # Parse cty.dat
+    def build(self,fname):
+        with open(fname,'r',encoding='latin-1') as fp:
+            txt=fp.read()
+
+        entry=None
+        for rec in txt.split(';'):
+            lines=rec.strip().split('\n')
+            if len(lines)==0 or ':' not in lines[0]:
+                continue
+            hdr=[x.strip() for x in lines[0].split(':')]
+            if len(hdr)<8:
+                continue
+            entry=(hdr[0],int(hdr[1]),int(hdr[2]),hdr[3],float(hdr[4]),-float(hdr[5]))
+            aliases=''.join(lines[1:]).replace(' ','')
+            for alias in aliases.split(','):
+                if alias:
+                    self.add(alias,entry)
+        return self
+
+    # Add a single prefix or exact call, along with any overrides
+    def add(self,alias,entry):
+        country,cqz,ituz,cont,lat,lon = entry
+        for m in OVERRIDE_RE.finditer(alias):
+            if m.group(1):
+                cqz=int(m.group(1))
+            elif m.group(2):
+                ituz=int(m.group(2))
+            elif m.group(3):
+                lat=float(m.group(3))
+                lon=-float(m.group(4))
+            elif m.group(5):
+                cont=m.group(5)
+        key=OVERRIDE_RE.sub('',alias)
+        entry=(country,cqz,ituz,cont,lat,lon)
+
+        if key[0]=='=':
+            self.exact[key[1:]]=entry
+        else:
+            node=self.root
+            for c in key:
+                node=node.setdefault(c,{})
+            node['']=(key,entry)
+            self.nprefixes+=1
+
+    # Longest prefix match - returns (prefix,entry) or (None,None)
+    def match(self,call):
+        best=(None,None)
+        node=self.root
+        for c in call:
+            node=node.get(c)
+            if node==None:
+                break
+            if '' in node:
+                best=node['']
+        return best
+
+    # Resolve a call, taking care of exact matches and portable designators
+    def lookup(self,call):
+        call=call.upper()
+        if call in self.exact:
+            return CTY_STATION(call,call,call,self.exact[call])
+
+        home=homecall(call)
+        if any(p in NO_COUNTRY for p in call.split('/')[1:]):
+            return CTY_STATION(call,home,None,None)
+        if home in self.exact and home==call.split('/')[0]:
+            return CTY_STATION(call,home,home,self.exact[home])
+
+        # Figure out what part of the call determines the country
+        parts=[p for p in call.split('/') if p and p not in SUFFIXES]
+        key=home
+        for p in parts:
+            if p==home:
+                continue
+            if p.isdigit() and len(p)==1:
+                # Call area change, e.g. W1AW/4 -> W4
+                m=re.search(r'\d',home)
+                if m:
+                    key=home[:m.start()]+p
+            else:
+                # Prefix, e.g. KH6/W1AW or W1AW/KH6
+                key=p
+        prefix,entry=self.match(key)
+        return CTY_STATION(call,home,prefix,entry)
+
+############################################################################################
+
+# Function to find cty.dat in the data directory
+def find_cty_file(DIR):
+    DIR=os.path.expanduser(DIR)
+    for f in CTY_FILES:
+        fname=os.path.join(DIR,f)
+        if os.path.isfile(fname):
+            return fname
+    return None
+
+# Function to load the trie - from the snapshot if its still good, otherwise from cty.dat
+def load_cty_trie(DIR):
+    fname=find_cty_file(DIR)
+    if fname==None:
+        return None
+    st=os.stat(fname)
+    key=(SNAPSHOT_VERSION,st.st_size,st.st_mtime_ns)
+    snapshot=os.path.join(os.path.dirname(fname),'.'+os.path.basename(fname)+'.trie')
+
+    try:
+        with open(snapshot,'rb') as fp:
+            if pickle.load(fp)==key:
+                return pickle.load(fp)
+    except (OSError,EOFError,pickle.UnpicklingError):
+        pass
+
+    print('Building cty trie from',fname,'...')
+    trie=CTY_TRIE().build(fname)
+    try:
+        tmp=snapshot+'.tmp'
+        with open(tmp,'wb') as fp:
+            pickle.dump(key,fp)
+            pickle.dump(trie,fp,protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp,snapshot)
+    except OSError as e:
+        print('CTY TRIE - Unable to write snapshot',snapshot,'-',str(e))
+    return trie
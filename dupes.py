@@ -0,0 +1,74 @@
+############################################################################################
+#
+# dupes.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Dupe checking with a hash table.  Each contest says what makes a QSO unique with
+# a set of dupe rules, e.g.
+#
+#    self.DUPE_RULES = {'key'   : ('call','band','mode'),       # Fields that must match
+#                       'rapid' : 2}                            # Minutes
+#
+# Mode only needs to be in the key for mixed mode contests that allow a station
+# to be worked once per mode.
+#
+# The time each key was last seen is kept so both normal & "rapid" dupes (e.g. the
+# same FT4/8 QSO logged twice) are found with a single lookup.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+DUPE_KEY     = ('call','band')      # Default - once per band
+RAPID_WINDOW = 2                    # Minutes
+
+############################################################################################
+
+# Dupe checker for a contest
+class DUPE_CHECKER:
+
+    # The raw QSO count (nqsos1) of the scorer sc, if given, is kept up to date
+    # the same as CONTEST_SCORING.check_dupes does
+    def __init__(self,rules,sc=None):
+        self.fields  = tuple( rules.get('key',DUPE_KEY) )
+        self.rapid   = rules.get('rapid',RAPID_WINDOW)
+        self.sc      = sc
+        self.last_seen = {}
+        self.ndupes  = 0
+        self.nrapid  = 0
+
+    # Function to form the key for a QSO
+    def key(self,rec):
+        return tuple( str(rec.get(f,'')).upper() for f in self.fields )
+
+    # Function to check a QSO - returns (dupe,rapid) same as CONTEST_SCORING.check_dupes
+    def check(self,rec):
+        if self.sc:
+            self.sc.nqsos1+=1
+        key=self.key(rec)
+        t=rec['time_stamp']
+        last=self.last_seen.get(key)
+        self.last_seen[key]=t
+
+        if last==None:
+            return False,False
+        self.ndupes+=1
+        print('\n*** DUPE ***',' '.join(key),'\t',t,'- last worked',last)
+        rapid = (t-last).total_seconds()<=60*self.rapid
+        if rapid:
+            self.nrapid+=1
+        return True,rapid
+
+    # Function to check if a QSO would be a dupe without adding it
+    def is_dupe(self,rec):
+        return self.key(rec) in self.last_seen
@@ -0,0 +1,87 @@
+############################################################################################
+#
+# exchanges.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Exchange tracker for multi-QSOs.  Still maps each call to the list of exchanges
+# received from it, same as the old EXCHANGES dict, but the first exchange from a
+# call is taken as its canonical exchange and any QSO that doesn't match it is
+# flagged as soon as it's added.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import sys
+
+############################################################################################
+
+# Exchange tracker - dict of call -> list of exchanges
+class EXCHANGE_TRACKER(dict):
+
+    def __init__(self,verbose=True):
+        super().__init__()
+        self.verbose   = verbose
+        self.iqso      = None           # Index of the QSO being scored
+        self.indices   = {}             # call -> list of QSO indices, same order as exchanges
+        self.conflicts = {}             # call -> list of QSO indices that don't match the first
+
+    # Function to say which QSO is being scored - so conflicts can be traced back to it
+    def set_qso(self,i):
+        self.iqso=i
+
+    # Function to add an exchange for a call
+    def add(self,call,exch):
+        call=sys.intern(call)
+        exch=sys.intern(exch)
+        if call not in self:
+            self[call]=[exch]
+            self.indices[call]=[self.iqso]
+            return True
+
+        self[call].append(exch)
+        self.indices[call].append(self.iqso)
+        if exch==self[call][0]:
+            return True
+
+        # Exchange doesn't match what we got the first time
+        self.conflicts.setdefault(call,[]).append(self.iqso)
+        if self.verbose:
+            print('\n*** Exchange mismatch *** ',call,':',exch,self.qso_no(self.iqso),
+                  '- first was',self[call][0],self.qso_no(self.indices[call][0]))
+        return False
+
+    # Function to format a QSO no. for printing
+    def qso_no(self,i):
+        if i==None:
+            return ''
+        return '(QSO '+str(i+1)+')'
+
+    # Function to check if a call has sent a consistent exchange
+    def consistent(self,call):
+        return call not in self.conflicts
+
+    # Function to collect the QSO indices for each different exchange from a call
+    def by_exchange(self,call):
+        exchs={}
+        for exch,i in zip(self[call],self.indices[call]):
+            exchs.setdefault(exch,[]).append(i)
+        return exchs
+
+    # Summary of calls with more than one exchange
+    def report(self):
+        print('\nMulti-QSO exchange check:',len(self),'calls,',len(self.conflicts),'with conflicts')
+        for call in self.conflicts:
+            print('   ',call)
+            for exch,idx in self.by_exchange(call).items():
+                print('\t%-20s\t%s' % (exch,' '.join([self.qso_no(i) for i in idx])))
@@ -23,7 +23,9 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
-from dx.spot_processing import Station
+from timestamps import cabrillo_date_time
+from exchanges import EXCHANGE_TRACKER
+from station_cache import station_cache_report
 from pprint import pprint
 from utilities import reverse_cut_numbers
 
@@ -39,6 +41,13 @@ class FOCBW_SCORING(CONTEST_SCORING):
 
     def __init__(self,P,session=None):
         super().__init__(P,'FOC-BW',mode='CW')
+
+        # History columns to load up front - anything else is loaded if its used
+        self.HIST_FIELDS = ['foc','name']
+
+        # What makes a QSO unique - see dupes.py
+        self.DUPE_RULES = {'key':('call','band')}
+        self.EXCHANGES  = EXCHANGE_TRACKER()
         
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
         self.sec_cnt = np.zeros(len(self.BANDS),dtype=int)
@@ -85,7 +94,6 @@ class FOCBW_SCORING(CONTEST_SCORING):
     # Scoring routine for FOC BW
     def qso_scoring(self,rec,dupe,qsos,HIST,MY_MODE,HIST2=None):
         #print('rec=',rec)
-        keys=list(HIST.keys())
 
         # Pull out relavent entries
         call = rec["call"].upper()
@@ -94,10 +102,9 @@ class FOCBW_SCORING(CONTEST_SCORING):
         if len(num)>2:
             num = reverse_cut_numbers(num)
         name = rec["name"].upper()
-        freq_khz = int( 1000*float(rec["freq"]) +0.5 )
+        freq_khz = rec.freq_khz
         band = rec["band"]
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        date_off,time_off = cabrillo_date_time(rec)
         if MY_MODE=='CW':
             mode='CW'
         else:
@@ -133,18 +140,9 @@ class FOCBW_SCORING(CONTEST_SCORING):
             if TRAP_ERRORS:
                 sys.exit(0)
 
-        # Check for DX calls
-        if call not in keys and '/' in call:
-            dx_station = Station(call)
-            #pprint(vars(dx_station))
-            call2 = dx_station.homecall
-            #print(HIST[call])
-            #sys.exit(0)
-        else:
-            call2=call
-
-        # Check against history
-        if call2 in keys:
+        # Check against history - portable calls are looked up by their home call
+        call2 = HIST.resolve(call)
+        if call2!=None:
             
             #print 'hist=',HIST[call2]
             foc=HIST[call2]['foc']
@@ -154,21 +152,18 @@ class FOCBW_SCORING(CONTEST_SCORING):
             if num!=foc or name!=name9:
                 print('\n$$$$$$$$$$ Difference from history $$$$$$$$$$$')
                 print(call,':  Current:',name,num,' - History:',name9,foc)
-                self.list_all_qsos(call,qsos)
+                self.qso_index.list_all_qsos(call)
                 print(' ')
 
         else:
             
             print('\n++++++++++++ Warning - no history for call:',call)
-            self.list_all_qsos(call,qsos)
-            self.list_similar_calls(call,qsos)
+            self.qso_index.list_all_qsos(call)
+            self.similar_calls.list_similar_calls(call)
 
         # Info for multi-qsos
         exch_in=name+' '+num
-        if call in self.EXCHANGES.keys():
-            self.EXCHANGES[call].append(exch_in)
-        else:
-            self.EXCHANGES[call]=[exch_in]
+        self.EXCHANGES.add(call,exch_in)
                         
         # Count no. of CWops guys worked
         self.count_cwops(call,HIST,rec)
@@ -205,4 +200,6 @@ class FOCBW_SCORING(CONTEST_SCORING):
               int( (100.*self.num_running)/self.nqsos1+0.5),'%')
         print('# QSOs S&P      =',self.num_sandp,' =',
               int( (100.*self.num_sandp)/self.nqsos1+0.5),'%')
+
+        station_cache_report()
         
@@ -0,0 +1,176 @@
+############################################################################################
+#
+# follow.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Follow mode - keep the scorer, history & station cache loaded after the log has
+# been scored and poll the input ADIF logs for QSOs appended to them.  Only the new
+# QSOs are dupe checked & scored and the running score, rate & mults are printed
+# after each batch, so an update during the contest costs about the same as the
+# no. of new QSOs.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import time
+import bisect
+from fileio import parse_file_name
+from adif_reader import ADIF_READER
+from ingest import window_filter
+from exchanges import EXCHANGE_TRACKER
+
+############################################################################################
+
+POLL_INTERVAL = 5                   # Seconds
+
+############################################################################################
+
+# Watches the input logs for new records
+class LOG_FOLLOWER:
+
+    def __init__(self,fnames,date0,date1,contest_id=None,positions={}):
+        self.date0   = date0
+        self.date1   = date1
+        self.readers = []
+        self.sizes   = {}
+        for fname in fnames:
+            p,n,ext=parse_file_name(fname)
+            if ext in ['.LOG','.csv']:
+                print('FOLLOW - Not following',fname,'- only ADIF logs can be followed')
+                continue
+
+            # Pick up where the first read of the log left off
+            reader = ADIF_READER(fname,date0,date1,contest_id)
+            if positions.get(fname)!=None:
+                reader.pos = positions[fname]
+            else:
+                reader.skip_to_end()
+            self.readers.append(reader)
+            self.sizes[fname] = None
+
+    # Function to pick up any records added to the logs since the last poll.
+    # Returns the new QSOs in time order.
+    def poll(self):
+        qsos=[]
+        for reader in self.readers:
+            fname=reader.fname
+            try:
+                size=os.path.getsize(fname)
+            except OSError:
+                continue
+            if size==self.sizes[fname]:
+                continue
+            self.sizes[fname]=size
+            if size<reader.pos:
+                # Log was rewritten - we can't tell what's new so start over at the end
+                print('\nFOLLOW - Log got shorter, skipping to the end:',fname)
+                reader.skip_to_end()
+                continue
+
+            # A bad record won't get any better so it's skipped rather than stopping the follower
+            qsos1,nlate = window_filter(reader.records(reader.pos),self.date0,self.date1,
+                                        skip_bad=True)
+            for rec in qsos1:
+                rec['source_file']=fname
+            qsos+=qsos1
+
+        qsos.sort(key=lambda x: x['time_stamp'])
+        return qsos
+
+############################################################################################
+
+# Function to score a new QSO - same steps as the main loop in cabrillo.py.
+# The QSO is added to the list, call indices & off time (for the -limit check) first.
+def score_new_qso(P,rec,qsos,HIST,dupes,istart,off=None):
+    sc=P.sc
+    i=len(qsos)
+    qsos.append(rec)
+    sc.qso_index.add(i)
+    sc.similar_calls.add(rec['call'])
+    if off!=None:
+        op_time=off.add(rec.epoch)
+
+    if dupes:
+        dupe,rapid = dupes.check(rec)
+    else:
+        dupe,rapid = sc.check_dupes(rec,qsos,i,istart)
+    if rapid and sc.contest!='FT8-RU':
+        print('<<<<<<<<<<< RAPID dupe skipped >>>>>>>>>>>>>>\n')
+        sc.nskipped+=1
+        return False
+
+    # Check for operating time limit
+    if off!=None and op_time>P.TIME_LIMIT:
+        print('<<<<<<<<<<< Time limit exceeded >>>>>>>>>>>>>>',
+              60*(op_time-P.TIME_LIMIT),'\t',rec['call'])
+        sc.nskipped+=1
+        dupe=True
+
+    if isinstance(sc.EXCHANGES,EXCHANGE_TRACKER):
+        sc.EXCHANGES.set_qso(i)
+    sc.qso_scoring(rec,dupe,qsos,HIST,sc.my_mode,P.HIST2)
+    return not dupe
+
+# Function to get the running totals - score, points & mults for scorers with
+# live queries (see live.py), just the points for the others
+def running_totals(sc):
+    if hasattr(sc,'score_totals'):
+        points,mults = sc.score_totals()
+        return points*mults,points,mults
+    return None,sc.total_points,None
+
+# Function to count the QSOs in the last few minutes
+def recent_qsos(epochs,t,mins):
+    return len(epochs) - bisect.bisect_left(epochs,t-60*mins)
+
+# Function to keep scoring QSOs as they are added to the logs - runs until ^C
+def follow_logs(P,follower,qsos,HIST,dupes,istart=0,interval=POLL_INTERVAL,off=None):
+    sc=P.sc
+    if sc.contest in ['13 Colonies Special Event','Satellites Worked','Specific Call']:
+        print('\nFOLLOW - Not available for',sc.contest)
+        return
+    if len(follower.readers)==0:
+        print('\nFOLLOW - No logs to follow')
+        return
+
+    epochs=[rec.epoch for rec in qsos]
+    print('\nFollowing',len(follower.readers),'log(s) - polling every',interval,'sec - ^C to stop')
+    try:
+        while True:
+            time.sleep(interval)
+            new=follower.poll()
+            if len(new)==0:
+                continue
+
+            score0,points0,mults0 = running_totals(sc)
+            for rec in new:
+                score_new_qso(P,rec,qsos,HIST,dupes,istart,off)
+                bisect.insort(epochs,rec.epoch)
+            score,points,mults = running_totals(sc)
+
+            t=epochs[-1]
+            rate10=recent_qsos(epochs,t,10)*6
+            rate60=recent_qsos(epochs,t,60)
+            print('\n%s  +%d QSO(s): %s' %
+                  (new[-1]['time_stamp'],len(new),' '.join([rec['call'] for rec in new])))
+            if score!=None:
+                print('QSOs=%d  Points=%d (+%d)  Mults=%d (+%d)  Score=%d (+%d)  Rate=%d/%d per hour' %
+                      (sc.nqsos2,points,points-points0,mults,mults-mults0,score,score-score0,rate10,rate60))
+            else:
+                print('QSOs=%d  Points=%d (+%d)  Rate=%d/%d per hour' %
+                      (sc.nqsos2,points,points-points0,rate10,rate60))
+
+    except KeyboardInterrupt:
+        print('\nDone following logs -',len(qsos),'QSOs')
@@ -0,0 +1,135 @@
+############################################################################################
+#
+# grids.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Maidenhead grid square distances over whole arrays of grids.  Same results as
+# pyhamtools.locator.calculate_distance - center of the (sub/extended) square and the
+# haversine formula with R=6371 km - but all of the grids in a log are converted
+# at once.  FT8 logs repeat the same 4-character grids over & over so the
+# distance to each grid is only computed once.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import re
+import numpy as np
+
+############################################################################################
+
+R_EARTH = 6371.                     # km
+GRID_RE = re.compile(r'^[A-R]{2}[0-9]{2}([A-X]{2}([0-9]{2})?)?$')
+
+############################################################################################
+
+# Function to check for a valid 4, 6 or 8 character grid
+def valid_grid(grid):
+    return GRID_RE.match(grid.upper())!=None
+
+# Function to convert grid squares (4, 6 or 8 characters) to lat & lon (degrees) of their centers.
+# Invalid grids give NaNs.
+def grid_latlon(grids):
+    grids=[g.upper() for g in grids]
+    ok=np.array([GRID_RE.match(g)!=None for g in grids],dtype=bool)
+    grids=[g if v else 'AA00' for g,v in zip(grids,ok)]
+    b=np.array([g.ljust(8) for g in grids],dtype='S8').view(np.uint8).reshape(-1,8).astype(float)
+
+    lon = -180. + (b[:,0]-65)*20 + (b[:,2]-48)*2
+    lat =  -90. + (b[:,1]-65)*10 + (b[:,3]-48)
+    sub = b[:,4]!=32
+    ext = b[:,6]!=32
+    lon += np.where(sub,(b[:,4]-65)*5./60.,0.)
+    lat += np.where(sub,(b[:,5]-65)*2.5/60.,0.)
+    lon += np.where(ext,(b[:,6]-48)*0.5/60.,0.)
+    lat += np.where(ext,(b[:,7]-48)*0.25/60.,0.)
+
+    # Center of the square, subsquare or extended square
+    lon += np.where(ext,0.25/60.,np.where(sub,2.5/60.,1.))
+    lat += np.where(ext,0.125/60.,np.where(sub,1.25/60.,0.5))
+
+    lat[~ok]=np.nan
+    lon[~ok]=np.nan
+    return lat,lon
+
+# Function to compute great circle distances (km)
+def haversine(lat1,lon1,lat2,lon2):
+    lat1,lon1,lat2,lon2 = [np.radians(x) for x in (lat1,lon1,lat2,lon2)]
+    a = np.sin((lat2-lat1)/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin((lon2-lon1)/2)**2
+    return 2*R_EARTH*np.arctan2(np.sqrt(a),np.sqrt(1-a))
+
+# Function to compute distances (km) from a home grid to an array of grids
+def grid_distances(grids,home):
+    lat0,lon0 = grid_latlon([home])
+    lat,lon   = grid_latlon(grids)
+    return haversine(lat0[0],lon0[0],lat,lon)
+
+############################################################################################
+
+# Memoized table of distances (rounded to the nearest km) from the home grid
+class GRID_DISTANCES:
+
+    def __init__(self,home):
+        self.home    = home
+        self.table   = {}
+        self.qso_row = {}                   # QSO -> row of qso_kms
+        self.qso_kms = None
+
+    # Function to add a bunch of grids to the table - all new grids are done at once
+    def fill(self,grids):
+        new=list( set(g.upper() for g in grids) - self.table.keys() )
+        if len(new)==0:
+            return
+        km=grid_distances(new,self.home)
+        for g,d in zip(new,km):
+            if not np.isnan(d):
+                self.table[g]=int(d+0.5)
+
+    # Function to look up the distance to a grid
+    def km(self,grid):
+        g=grid.upper()
+        if g not in self.table:
+            self.fill([g])
+            if g not in self.table:
+                raise ValueError('Invalid grid square: '+grid)
+        return self.table[g]
+
+    # Function to look up the distances to an array of grids
+    def km_array(self,grids):
+        self.fill(grids)
+        return np.array([self.table.get(g.upper(),-1) for g in grids],dtype=int)
+
+    # Function to compute the distances for all of the QSOs in a log in one shot.
+    # grid_of pulls the grid out of a QSO.
+    def fill_qsos(self,qsos,grid_of):
+        self.qso_row = {id(rec):i for i,rec in enumerate(qsos)}
+        self.qso_kms = self.km_array([grid_of(rec) for rec in qsos])
+
+    # Function to look up the distance for a QSO.  QSOs that weren't in the log
+    # (e.g. follow mode) or have a bad grid go by the grid.
+    def qso_km(self,rec,grid):
+        i=self.qso_row.get(id(rec))
+        if i!=None and self.qso_kms[i]>=0:
+            return int(self.qso_kms[i])
+        return self.km(grid)
+
+    def __len__(self):
+        return len(self.table)
+
+# Function to get summary stats of a set of distances - max, total & no. QSOs in each
+# bucket of the given size (e.g. 3000 km for WW-DIGI)
+def distance_stats(km,bucket=3000):
+    km=np.asarray(km,dtype=int)
+    if len(km)==0:
+        return 0,0,np.zeros(0,dtype=int)
+    return int(km.max()),int(km.sum()),np.bincount(km//bucket)
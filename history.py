@@ -0,0 +1,354 @@
+############################################################################################
+#
+# history.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Read-only, indexed view of the call history (e.g. master.csv).  Lookups are a
+# single hash probe - portable calls, e.g. KH6/W1AW/P, fall back to the home call
+# if the full call isn't in the history.
+#
+# The history is kept as columns - one array per field plus a call -> row index.
+# These are saved as a snapshot next to the history file(s) and memory mapped on
+# the next run.  The snapshot is rebuilt whenever any of the source files change -
+# each one is written to a new directory so runs that have the old one mapped
+# aren't affected.
+# Each contest says which fields it needs - only those columns are loaded up front.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import glob
+import time
+import zlib
+import shutil
+import pickle
+import tempfile
+import numpy as np
+from collections.abc import Mapping
+from cty_trie import homecall
+
+############################################################################################
+
+SNAPSHOT_VERSION = 2
+
+############################################################################################
+
+# One row of the history - fields are pulled out of the columns when they're used.
+# The row no. is looked up each time in case the snapshot was reloaded.
+class HIST_ROW(Mapping):
+
+    def __init__(self,hist,key):
+        self.hist = hist
+        self.key  = key
+
+    def __getitem__(self,field):
+        col=self.hist.column(field)
+        v=col[self.hist.index[self.key]]
+        if isinstance(v,str):
+            return str(v)
+        return v
+
+    def __iter__(self):
+        return iter(self.hist.fields)
+
+    def __len__(self):
+        return len(self.hist.fields)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+# Read-only mapping of call -> history row.  index maps each call to its row no.
+# and columns maps each field name to an array with one entry per row.  If a loader
+# is given, any of the fields that aren't in columns are loaded the first time
+# they're needed.
+class HISTORY(Mapping):
+
+    def __init__(self,index,columns,fields=None,loader=None):
+        self.index   = index
+        self.columns = columns
+        self.loader  = loader
+        if fields==None:
+            self.fields = list(columns.keys())
+        else:
+            self.fields = list(fields)
+
+    # Function to figure out which history entry goes with a call.
+    # Returns None if there isn't one.
+    def resolve(self,call):
+        call=call.upper()
+        if call in self.index:
+            return call
+        if '/' in call:
+            home=homecall(call)
+            if home in self.index:
+                return home
+        return None
+
+    # Function to get a column, loading it if necessary.  If the snapshot has been
+    # rebuilt since we read the index, the whole thing is reloaded first so the
+    # index & columns always match.
+    def column(self,field):
+        if field not in self.columns:
+            if self.loader==None or field not in self.fields:
+                raise KeyError(field)
+            if not self.loader.current():
+                self.reload()
+            print('HISTORY - Loading column',field)
+            try:
+                self.columns[field]=self.loader(field)
+            except OSError:
+                # Rebuilt between the check & the load
+                self.reload()
+                self.columns[field]=self.loader(field)
+        return self.columns[field]
+
+    # Function to reload the index & the columns we have from the current snapshot
+    def reload(self):
+        print('HISTORY - Snapshot has changed - reloading')
+        self.index,self.fields,self.loader = self.loader.reload()
+        self.columns={f:self.loader(f) for f in self.columns if f in self.fields}
+
+    def __getitem__(self,call):
+        key=self.resolve(call)
+        if key==None:
+            raise KeyError(call)
+        return HIST_ROW(self,key)
+
+    def __contains__(self,call):
+        return self.resolve(call)!=None
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+############################################################################################
+
+# Function to convert the dict of dicts from load_history to columns
+def history_columns(hist):
+    calls=list(hist.keys())
+    fields=[]
+    for row in hist.values():
+        for f in row.keys():
+            if f not in fields:
+                fields.append(f)
+
+    columns={}
+    for f in fields:
+        vals=[hist[c].get(f,'') for c in calls]
+        if all(type(v) is str for v in vals):
+            columns[f]=np.array(vals,dtype=str)
+        else:
+            columns[f]=np.array(vals,dtype=object)
+    index={c:i for i,c in enumerate(calls)}
+    return index,columns
+
+# Function to form name of the snapshot directory for a history file (or glob)
+def snapshot_dir(fname):
+    p,n = os.path.split( os.path.abspath(os.path.expanduser(fname)) )
+    return os.path.join(p,'.'+n.replace('*','ALL').replace('?','_')+'.hist')
+
+# Function to get the key that says which versions of the source files a snapshot is for
+def snapshot_key(fnames):
+    key=[SNAPSHOT_VERSION]
+    for f in fnames:
+        st=os.stat(f)
+        key.append( (f,st.st_size,st.st_mtime_ns) )
+    return key
+
+# Function to read which generation of a snapshot is current - None if there isn't one
+def current_generation(dname):
+    try:
+        with open(os.path.join(dname,'CURRENT'),'r') as fp:
+            return fp.read().strip()
+    except OSError:
+        return None
+
+# Function to load one column of a snapshot
+def load_column(gname,i):
+    fname=os.path.join(gname,'col%03d.npy' % i)
+    try:
+        return np.load(fname,mmap_mode='r')
+    except ValueError:
+        # Object columns can't be mapped
+        return np.load(fname,allow_pickle=True)
+
+# Function to read the meta data of one generation of a snapshot -
+# returns (key,fields,fname9,index) or None if its missing or corrupt
+def load_meta(gname):
+    try:
+        with open(os.path.join(gname,'meta.pkl'),'rb') as fp:
+            key        = pickle.load(fp)
+            all_fields = pickle.load(fp)
+            fname9     = pickle.load(fp)
+            crc        = pickle.load(fp)
+            blob       = pickle.load(fp)
+        if zlib.crc32(blob)!=crc:
+            print('HISTORY - Snapshot index is corrupt',gname)
+            return None
+        return key,all_fields,fname9,pickle.loads(blob)
+    except (OSError,EOFError,ValueError,pickle.UnpicklingError):
+        return None
+
+# Loads the columns of one generation of a snapshot as they're needed
+class SNAPSHOT_LOADER:
+
+    def __init__(self,dname,gen,fields):
+        self.dname  = dname
+        self.gen    = gen
+        self.fields = fields
+
+    # Function to check that this is still the current snapshot
+    def current(self):
+        return current_generation(self.dname)==self.gen
+
+    def __call__(self,field):
+        return load_column(os.path.join(self.dname,self.gen),self.fields.index(field))
+
+    # Function to switch to the current snapshot - returns (index,fields,loader)
+    def reload(self):
+        gen=current_generation(self.dname)
+        meta=None
+        if gen!=None:
+            meta=load_meta(os.path.join(self.dname,gen))
+        if meta==None:
+            raise RuntimeError('HISTORY - Snapshot '+self.dname+' is gone - cant reload')
+        key,all_fields,fname9,index = meta
+        return index,all_fields,SNAPSHOT_LOADER(self.dname,gen,all_fields)
+
+# Function to read a snapshot - returns None if its missing or stale.
+# Only the columns in fields are loaded now, the rest are loaded if they're used.
+def load_snapshot(dname,key,fields=None):
+    gen=current_generation(dname)
+    if gen==None:
+        return None
+    meta=load_meta(os.path.join(dname,gen))
+    if meta==None or meta[0]!=key:
+        return None
+    key,all_fields,fname9,index = meta
+    loader=SNAPSHOT_LOADER(dname,gen,all_fields)
+    if fields==None:
+        fields=all_fields
+    try:
+        columns={}
+        for f in fields:
+            if f in all_fields:
+                columns[f]=loader(f)
+    except (OSError,ValueError):
+        return None
+    return HISTORY(index,columns,all_fields,loader),fname9
+
+# Function to write a snapshot.  Each snapshot goes in its own directory, which is
+# never changed once its in place - other runs may have its columns memory mapped.
+# The directory is filled in under a temp name, renamed & then made current.
+def save_snapshot(dname,key,HIST,fname9):
+    try:
+        os.makedirs(dname,exist_ok=True)
+        tmp=tempfile.mkdtemp(prefix='tmp',dir=dname)
+        for i,f in enumerate(HIST.fields):
+            col=HIST.column(f)
+            np.save(os.path.join(tmp,'col%03d.npy' % i),col,allow_pickle=col.dtype==object)
+        blob=pickle.dumps(HIST.index,protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(tmp,'meta.pkl'),'wb') as fp:
+            pickle.dump(key,fp)
+            pickle.dump(HIST.fields,fp)
+            pickle.dump(fname9,fp)
+            pickle.dump(zlib.crc32(blob),fp)
+            pickle.dump(blob,fp,protocol=pickle.HIGHEST_PROTOCOL)
+
+        gen='gen%x-%d' % (time.time_ns(),os.getpid())
+        os.rename(tmp,os.path.join(dname,gen))
+        with open(os.path.join(dname,'CURRENT.tmp%d' % os.getpid()),'w') as fp:
+            fp.write(gen)
+        os.replace(fp.name,os.path.join(dname,'CURRENT'))
+    except OSError as e:
+        print('HISTORY - Unable to write snapshot',dname,'-',str(e))
+        return
+
+    # Clean out the old snapshots - runs that still have them mapped keep their copy
+    for f in os.listdir(dname):
+        if f!=gen and not f.startswith('CURRENT') and not f.startswith('tmp'):
+            path=os.path.join(dname,f)
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+
+# Function to load the history file(s) - from the snapshot if its still good.
+# fields are the columns the contest actually uses - None for all of them.
+def read_history(fname,use_cache=True,fields=None):
+
+    fnames=sorted( glob.glob(os.path.expanduser(fname)) ) if fname else []
+    if use_cache and len(fnames)>0:
+        dname=snapshot_dir(fname)
+        key=snapshot_key(fnames)
+        snap=load_snapshot(dname,key,fields)
+        if snap:
+            print('History snapshot',dname,'-',len(snap[0]),'calls -',
+                  len(snap[0].columns),'of',len(snap[0].fields),'columns loaded')
+            return snap
+
+    from load_history import load_history
+    hist,fname9 = load_history(fname)
+    HIST = HISTORY(*history_columns(hist))
+    del hist
+    if use_cache and len(fnames)>0:
+        save_snapshot(dname,key,HIST,fname9)
+    return HIST,fname9
+
+############################################################################################
+
+# Micro-benchmark - per-QSO lookup cost vs. size of the history
+if __name__ == '__main__':
+
+    import time
+    import random
+    import string
+
+    def random_call():
+        return random.choice(['K','N','W','AA','KB','VE'])+random.choice('0123456789')+ \
+            ''.join(random.choice(string.ascii_uppercase) for i in range(3))
+
+    NLOOKUPS=2000
+    print('%8s %18s %18s' % ('Size','keys list (usec)','HISTORY (usec)'))
+    for n in [1000,10000,50000]:
+        hist={}
+        while len(hist)<n:
+            hist[random_call()]={'name':'JOE','state':'CA','foc':''}
+        HIST=HISTORY(*history_columns(hist))
+        calls=random.sample(list(hist.keys()),NLOOKUPS//2)+ \
+            [random_call()+'/P' for i in range(NLOOKUPS//2)]
+
+        # The old way - list of keys built for every QSO
+        nold=min(NLOOKUPS,200)
+        t0=time.perf_counter()
+        for call in calls[:nold]:
+            keys=list(hist.keys())
+            found = call in keys
+        t1=time.perf_counter()
+        told=1e6*(t1-t0)/nold
+
+        t0=time.perf_counter()
+        for call in calls:
+            if call in HIST:
+                row=HIST[call]
+        t1=time.perf_counter()
+        tnew=1e6*(t1-t0)/NLOOKUPS
+
+        print('%8d %18.2f %18.2f' % (n,told,tnew))
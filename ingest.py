@@ -0,0 +1,181 @@
+############################################################################################
+#
+# ingest.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Routines to bring the QSOs from one or more input logs into a single, time-ordered
+# list for the scorer.  Each log is filtered to the contest window on its own, any
+# small out-of-order runs are repaired locally and the logs are then merged.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import bisect
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from fileio import parse_file_name,parse_simple_log,read_csv_file
+from adif_reader import ADIF_READER
+from log_cache import CACHED_ADIF_READER
+from timestamps import stamp_qsos,window_mask,attach_time_stamps
+from qso_record import QSO_RECORD
+
+############################################################################################
+
+MAX_REPAIRS = 0.01                  # Fraction of out-of-order QSOs we'll repair by hand
+
+############################################################################################
+
+# Raised when a QSO doesn't have a date we can read
+class BAD_DATE(ValueError):
+
+    def __init__(self,rec):
+        super().__init__(rec)
+        self.rec=rec
+
+############################################################################################
+
+# Function to pull out the QSOs inside the contest window and time stamp them.
+# The QSOs that are kept are converted to compact QSO records.
+# Returns the list of QSOs and the no. of QSOs found after the end of the contest.
+# A QSO without a date raises BAD_DATE unless skip_bad is set, in which case it is
+# reported and dropped.
+def window_filter(qsos1,date0,date1,skip_bad=False):
+
+    qsos1=list(qsos1)
+    for i in range(len(qsos1)-1,-1,-1):
+        if len(qsos1[i])==0:
+            print('Skipping blank record')
+            print('\n',i+1,qsos1[i])
+            del qsos1[i]
+
+    epochs,bad = stamp_qsos(qsos1)
+    if len(bad)>0 and not skip_bad:
+        raise BAD_DATE(qsos1[bad[0]])
+
+    inside,nlate = window_mask(epochs,date0,date1)
+    for i in bad:
+        print('\nSkipping record - cant figure out date!')
+        print(qsos1[i])
+        inside[i]=False
+    idx = np.flatnonzero(inside)
+    qsos = [QSO_RECORD(qsos1[i]) for i in idx]
+    attach_time_stamps(qsos,epochs[idx])
+
+    return qsos,nlate
+
+# Function to make sure a single log is in time order.
+# Logs are almost always already sorted, perhaps with a few QSOs that were
+# entered late.  Those are moved into place one at a time - if there are too many
+# of them, we just fall back to a full sort.
+def sort_log(qsos,key='time_stamp'):
+
+    n=len(qsos)
+    bad=[i for i in range(1,n) if qsos[i][key]<qsos[i-1][key]]
+    if len(bad)==0:
+        return qsos
+
+    print('SORT LOG -',len(bad),'QSOs out of order')
+    if len(bad)>MAX_REPAIRS*n:
+        qsos.sort(key=lambda x: x[key])
+        return qsos
+
+    # Insertion sort from the first bad QSO on - each late QSO is moved back into
+    # the already sorted part of the list, everything else is just a comparison.
+    times=[rec[key] for rec in qsos]
+    for i in range(bad[0],n):
+        t=times[i]
+        if t<times[i-1]:
+            j=bisect.bisect_right(times,t,0,i)
+            qsos.insert(j,qsos.pop(i))
+            times.insert(j,times.pop(i))
+    return qsos
+
+# Function to merge several time-ordered logs into one list.
+# The scorer needs the whole list anyway so the logs are just strung together and
+# sorted - the sort is stable (ties stay in the order the logs were given) and it
+# picks up the runs that are already in order so this is a merge in all but name.
+def merge_logs(logs,key='time_stamp'):
+    if len(logs)==1:
+        return logs[0]
+    qsos=[rec for qsos1 in logs for rec in qsos1]
+    qsos.sort(key=lambda x: x[key])
+    return qsos
+
+# Function to read a single input log and pull out the QSOs inside the contest window.
+# This is also the worker when several logs are read in parallel so it only uses its
+# args and returns everything the caller needs.  Each QSO is tagged with the name of
+# the log it came from.  Also returns the byte offset just past the last complete
+# record read from an ADIF log (None for other logs) - where follow mode picks up.
+def read_log_file(fname,date0,date1,contest_id=None,use_cache=True):
+
+    p,n,ext=parse_file_name(fname)
+    msgs=['fname= '+fname]
+    nlate=0
+    pos=None
+    if ext=='.LOG':
+        qsos1 = parse_simple_log(fname,None)
+    elif ext=='.csv':
+        msgs.append('Reading CSV file ...')
+        qsos1,hdr=read_csv_file(fname)
+    else:
+        # Only records inside the contest window are parsed
+        if use_cache:
+            reader = CACHED_ADIF_READER(fname,date0,date1,contest_id)
+        else:
+            reader = ADIF_READER(fname,date0,date1,contest_id)
+        qsos1 = list(reader)
+        msgs.append('Scanned %d records - %d inside contest window' % (reader.nrecs,reader.nkept))
+        if use_cache:
+            msgs.append('Log index '+reader.cache_file+' - '+reader.status)
+        nlate+=reader.nlate
+        pos=reader.pos
+
+    # Ignore entries outside contest window & make sure this log is in time order
+    qsos1,nlate1 = window_filter(qsos1,date0,date1)
+    for rec in qsos1:
+        rec['source_file']=fname
+    return sort_log(qsos1),nlate+nlate1,msgs,pos
+
+# Function to read all of the input logs, in parallel if there are several of them.
+# Returns the list of logs, in the same order as the input files, and the no. of QSOs
+# found after the end of the contest.  If positions is given, it is filled in with
+# the offset each log was read up to.
+def read_log_files(fnames,date0,date1,contest_id=None,use_cache=True,parallel=False,
+                   positions=None):
+
+    args=[(fname,date0,date1,contest_id,use_cache) for fname in fnames]
+    if parallel and len(fnames)>1:
+        nworkers=min(len(fnames),os.cpu_count() or 1)
+        print('Reading',len(fnames),'logs with',nworkers,'processes ...')
+        with ProcessPoolExecutor(max_workers=nworkers) as ex:
+            results=list( ex.map(read_log_file,*zip(*args)) )
+    else:
+        results=[read_log_file(*a) for a in args]
+
+    logs=[]
+    nlate=0
+    ntotal=0
+    for fname,(qsos1,nlate1,msgs,pos) in zip(fnames,results):
+        if positions!=None:
+            positions[fname]=pos
+        print('\nInput file:',fname)
+        for m in msgs:
+            print(m)
+        logs.append(qsos1)
+        nlate+=nlate1
+        ntotal+=len(qsos1)
+        print("There are ",len(qsos1),ntotal," QSOs")
+
+    return logs,nlate
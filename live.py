@@ -0,0 +1,109 @@
+############################################################################################
+#
+# live.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# "What is this QSO worth?" queries against the scoring state.  Once the log has
+# been scored, a call on a band (and optionally the exchange we expect) can be
+# checked for dupes, QSO points and new mults straight from the counters & mult
+# tables the scorer already keeps - nothing gets rescored.  Meant to be driven
+# from the keyer or from another process watching the log.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import sys
+import datetime
+
+############################################################################################
+
+# Query interface - mixed into the contest scorers.  Each scorer supplies
+#    qso_value(band,call,exch) -> (qso points, list of new mults)
+#    score_totals()            -> (total points, total mults) - score is their product
+class LIVE_QUERY:
+
+    # Function to check if a call would be a dupe on a band
+    def query_dupe(self,band,call,mode=None):
+        call=call.upper()
+        dupes=getattr(self,'dupe_checker',None)
+        if dupes:
+            rec={'call':call,'band':band,'mode':mode or self.my_mode,
+                 'time_stamp':datetime.datetime.utcnow()}
+            return dupes.is_dupe(rec)
+
+        # Contests w/o dupe rules - once per band (& mode) using the call index
+        index=getattr(self,'qso_index',None)
+        if index==None:
+            return False
+        for rec in index.all_qsos(call):
+            if rec.get('band')==band and (mode==None or rec.get('mode')==mode):
+                return True
+        return False
+
+    # Function to find the exchange we got from a call last time - if we've worked it
+    def last_exchange(self,call):
+        exchs=getattr(self,'EXCHANGES',None)
+        if exchs and call in exchs:
+            return exchs[call][-1]
+        return None
+
+    # Function to figure out what a QSO would be worth
+    def query(self,band,call,exch=None,mode=None):
+        call=call.upper()
+        if band not in self.BANDS:
+            return {'call':call,'band':band,'dupe':False,'points':0,'mults':0,
+                    'new_mults':[],'score':0,'error':'Band not in contest'}
+        dupe=self.query_dupe(band,call,mode)
+        if dupe:
+            points,new_mults = 0,[]
+        else:
+            points,new_mults = self.qso_value(band,call,exch)
+
+        total_points,total_mults = self.score_totals()
+        score=(total_points+points)*(total_mults+len(new_mults)) - total_points*total_mults
+        return {'call':call,'band':band,'dupe':dupe,'points':points,'mults':len(new_mults),
+                'new_mults':new_mults,'score':score}
+
+############################################################################################
+
+# Function to format a query result
+def format_query(q):
+    if 'error' in q:
+        return '%-10s %5s  %s' % (q['call'],q['band'],q['error'])
+    if q['dupe']:
+        return '%-10s %5s  DUPE' % (q['call'],q['band'])
+    txt='%-10s %5s  pts=%d  mults=%d  score=+%d' % \
+        (q['call'],q['band'],q['points'],q['mults'],q['score'])
+    if len(q['new_mults'])>0:
+        txt+='  NEW: '+' '.join([str(m) for m in q['new_mults']])
+    return txt
+
+# Function to answer queries, one per line - "BAND CALL [EXCH]" - until EOF
+def query_loop(sc,fp=sys.stdin):
+    if not hasattr(sc,'query'):
+        print('\nNo live queries for',sc.contest)
+        return
+    print('\nQueries: BAND CALL [EXCH]')
+    for line in fp:
+        words=line.split()
+        if len(words)==0:
+            continue
+        if len(words)<2:
+            print('??? Expected BAND CALL [EXCH] -',line.strip())
+            continue
+        band=words[0].lower()
+        if band[-1]!='m':
+            band+='m'
+        exch=' '.join(words[2:]) if len(words)>2 else None
+        print(format_query( sc.query(band,words[1],exch) ),flush=True)
@@ -0,0 +1,153 @@
+############################################################################################
+#
+# log_cache.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Persistent index of the records in an ADIF log.  The offset & time stamp of every
+# record is saved in a small binary file next to the log.  It is reused as long as
+# the log is unchanged and is extended when new QSOs have only been appended, so
+# repeated scoring runs during a contest weekend don't need to re-scan the whole log.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import mmap
+import zlib
+import numpy as np
+from adif_reader import ADIF_READER
+
+############################################################################################
+
+CACHE_VERSION = 2
+CRC_CHUNK     = 1<<20               # Checksum is computed a chunk at a time
+
+############################################################################################
+
+# Function to form name of index file for a log
+def cache_file_name(fname):
+    p,n = os.path.split( os.path.abspath(fname) )
+    return os.path.join(p,'.'+n+'.idx.npz')
+
+############################################################################################
+
+# ADIF reader that keeps an index of record offsets & time stamps on disk
+class CACHED_ADIF_READER(ADIF_READER):
+
+    def __init__(self,fname,date0=None,date1=None,contest_id=None):
+        super().__init__(fname,date0,date1,contest_id)
+        self.cache_file = cache_file_name(fname)
+        self.status     = 'none'
+
+    # Checksum of the log up to offset pos - used to make sure that the part
+    # of the log that was already indexed has not been edited anywhere
+    def prefix_crc(self,mm,pos):
+        crc=0
+        for i in range(0,pos,CRC_CHUNK):
+            crc=zlib.crc32( mm[i:min(i+CRC_CHUNK,pos)],crc )
+        return crc
+
+    # Read index file - returns None if its missing or doesn't belong to this log
+    def load_index(self):
+        try:
+            with np.load(self.cache_file) as z:
+                meta = z['meta']
+                if meta[0]!=CACHE_VERSION:
+                    return None
+                return {'size'  : int(meta[1]),
+                        'mtime' : int(meta[2]),
+                        'pos'   : int(meta[3]),
+                        'crc'   : int(meta[4]),
+                        'start' : z['start'],
+                        'end'   : z['end'],
+                        'epoch' : z['epoch']}
+        except (OSError,KeyError,ValueError,IndexError):
+            return None
+
+    # Write index file - atomically so an interrupted run can't leave a corrupt index
+    def save_index(self,st,mm,start,end,epoch):
+        meta = np.array([CACHE_VERSION,st.st_size,st.st_mtime_ns,self.pos,
+                         self.prefix_crc(mm,self.pos)],dtype=np.int64)
+        tmp = self.cache_file+'.tmp'
+        try:
+            with open(tmp,'wb') as fp:
+                np.savez(fp,meta=meta,start=start,end=end,epoch=epoch)
+            os.replace(tmp,self.cache_file)
+        except OSError as e:
+            print('LOG CACHE - Unable to write index',self.cache_file,'-',str(e))
+
+    # Scan part of the log and return the index arrays for it
+    def scan_index(self,mm,pos):
+        start=[]
+        end=[]
+        epoch=[]
+        for s,e,t in self.scan(mm,pos):
+            start.append(s)
+            end.append(e)
+            if t==None:
+                epoch.append(-1)
+            else:
+                epoch.append(t)
+        return np.array(start,dtype=np.int64),np.array(end,dtype=np.int64), \
+            np.array(epoch,dtype=np.int64)
+
+    # Get the index of the whole log, reusing and/or extending the saved one
+    def index(self,mm,st):
+        idx = self.load_index()
+        if idx and idx['size']==st.st_size and idx['mtime']==st.st_mtime_ns:
+            self.status = 'hit'
+            self.pos    = idx['pos']
+            return idx['start'],idx['end'],idx['epoch']
+
+        if idx and idx['size']<=st.st_size and idx['pos']<=st.st_size and \
+           self.prefix_crc(mm,idx['pos'])==idx['crc']:
+            # Only new records were appended
+            self.status = 'extended'
+            self.pos    = idx['pos']
+            s,e,t = self.scan_index(mm,idx['pos'])
+            start = np.concatenate( (idx['start'],s) )
+            end   = np.concatenate( (idx['end'],e) )
+            epoch = np.concatenate( (idx['epoch'],t) )
+        else:
+            self.status = 'rebuilt'
+            start,end,epoch = self.scan_index(mm,0)
+
+        self.save_index(st,mm,start,end,epoch)
+        return start,end,epoch
+
+    # Generator over records inside the window - only these are parsed
+    def records(self,pos=0):
+        with open(self.fname,'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_size==0:
+                return
+            with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as mm:
+                start,end,epoch = self.index(mm,st)
+                keep = (start>=pos) & (epoch<0)
+                inside = (start>=pos) & (epoch>=0)
+                if self.t0!=None:
+                    inside &= epoch>=self.t0
+                if self.t1!=None:
+                    late     = inside & (epoch>self.t1)
+                    inside  &= ~late
+                    self.nlate += int( np.count_nonzero(late) )
+                keep |= inside
+
+                self.nrecs += int( np.count_nonzero(start>=pos) )
+                for i in np.flatnonzero(keep):
+                    s=int(start[i])
+                    e=int(end[i])
+                    if self.right_contest(mm,s,e):
+                        self.nkept+=1
+                        yield self.parse(mm,s,e)
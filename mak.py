@@ -23,10 +23,10 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
+from timestamps import cabrillo_date_time
 from dx.spot_processing import Station, Spot, WWV, Comment, ChallengeData
 
-# Need this for Makrothen and WW-DIGI - it was broke but looking up error helped to fix it
-from pyhamtools.locator import calculate_distance
+from grids import GRID_DISTANCES
 
 #######################################################################################
     
@@ -40,6 +40,7 @@ class MAKROTHEN_SCORING(CONTEST_SCORING):
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
         self.sec_cnt = np.zeros((len(self.BANDS)))
         self.calls=set([])
+        self.grid_km=None
 
         # Determine start & end dates/times
         now = datetime.datetime.utcnow()
@@ -88,17 +89,21 @@ class MAKROTHEN_SCORING(CONTEST_SCORING):
         
         # Pull out relavent entries
         call = rec["call"]
-        freq_khz = int( 1000*float(rec["freq"]) +0.5 )
+        freq_khz = rec.freq_khz
         band = rec["band"]
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%d-%m')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        date_off,time_off = cabrillo_date_time(rec)
+        date_off = date_off[0:4]+date_off[7:10]+date_off[4:7]            # Y-D-M
         if "gridsquare" in rec:
             grid = rec["gridsquare"]
         else:
             grid = rec["qth"]
     
-        # Compute score for this entry
-        dx_km = int( calculate_distance(grid,self.MY_GRID[:4]) +0.5 )
+        # Compute score for this entry - the distances to all of the grids in the log
+        # are computed in one shot the first time through
+        if self.grid_km==None:
+            self.grid_km = GRID_DISTANCES(self.MY_GRID[:4])
+            self.grid_km.fill_qsos(qsos,lambda r: r.get('gridsquare',r.get('qth','')))
+        dx_km = self.grid_km.qso_km(rec,grid)
         if dx_km > self.max_km:
             self.max_km=dx_km
             self.longest=rec
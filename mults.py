@@ -0,0 +1,87 @@
+############################################################################################
+#
+# mults.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Per-band multiplier state kept as a boolean array - one row per band and one
+# column per multiplier (zone, country, state, ...).  "Is this a new mult" is a
+# single lookup, the no. of mults on each band is kept up to date as they come in
+# and the totals are just counts of the set bits.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import numpy as np
+
+############################################################################################
+
+# Multipliers worked on each band.  keys are the multipliers we know about up front,
+# e.g. zones 1-40 - anything else gets a column the first time its seen.
+class MULT_ARRAY:
+
+    def __init__(self,bands,keys=[],size=64):
+        self.bands   = list(bands)
+        self.iband   = {b:i for i,b in enumerate(self.bands)}
+        self.index   = {}
+        self.keys    = []
+        self.worked  = np.zeros((len(self.bands),max(size,len(keys))),dtype=bool)
+        self.nworked = np.zeros(len(self.bands),dtype=int)
+        for key in keys:
+            self.column(key)
+
+    # Function to get the column for a multiplier, adding one if need be
+    def column(self,key):
+        j=self.index.get(key)
+        if j==None:
+            j=len(self.keys)
+            self.index[key]=j
+            self.keys.append(key)
+            if j>=self.worked.shape[1]:
+                self.worked=np.hstack( (self.worked,np.zeros_like(self.worked)) )
+        return j
+
+    # Function to check if a mult would be new on a band
+    def is_new(self,band,key):
+        j=self.index.get(key)
+        return j==None or not self.worked[self.iband[band],j]
+
+    # Function to add a mult on a band - returns True if its a new one
+    def add(self,band,key):
+        i=self.iband[band]
+        j=self.column(key)
+        if self.worked[i,j]:
+            return False
+        self.worked[i,j]=True
+        self.nworked[i]+=1
+        return True
+
+    # No. mults on a band
+    def count(self,band):
+        return int( self.nworked[self.iband[band]] )
+
+    # Total no. of mults - each band counts separately
+    def total(self):
+        return int( np.count_nonzero(self.worked) )
+
+    # No. different mults worked on any band
+    def unique(self):
+        return int( np.count_nonzero(self.worked.any(axis=0)) )
+
+    # Mults worked on a band (or any band)
+    def worked_keys(self,band=None):
+        if band==None:
+            cols=np.flatnonzero(self.worked.any(axis=0))
+        else:
+            cols=np.flatnonzero(self.worked[self.iband[band]])
+        return [self.keys[j] for j in cols]
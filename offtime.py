@@ -0,0 +1,145 @@
+############################################################################################
+#
+# offtime.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Operating time & off time calculations.  All of the gaps between QSOs are found
+# in one pass over the array of QSO time stamps.  Gaps longer than the minimum off
+# time for the contest count as off time - the start and stop gaps always do.  The
+# running operating time is a cumulative sum so the point at which an operating time
+# limit (e.g. NAQP) is reached is found with a single search.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import datetime
+import numpy as np
+from adif_reader import datetime_epoch
+
+############################################################################################
+
+# Off time for a contest.  epochs are the (sorted) QSO times in seconds since 1970.
+# Gaps & off times are in minutes, operating times in hours, same as they've always
+# been reported.
+class OFF_TIME:
+
+    def __init__(self,epochs,date0,date1,min_gap):
+
+        t  = np.asarray(epochs,dtype=np.int64)
+        e0 = datetime_epoch(date0)
+        e1 = datetime_epoch(date1)
+        self.date0   = date0
+        self.date1   = date1
+        self.min_gap = min_gap
+        self.epochs  = t
+
+        # Gap before each QSO - the first one is the start gap
+        self.gaps = np.diff(np.concatenate( ([e0],t) )) / 60.
+        off       = self.gaps>min_gap
+        if len(t)>0:
+            off[0]=True
+        self.off  = off
+
+        # Off time periods, including the start & stop gaps
+        idx = np.flatnonzero(off)
+        starts = np.concatenate( ([e0],t) )[idx]
+        self.intervals = list( zip(starts.tolist(),t[idx].tolist()) )
+        if len(t)>0:
+            self.start_gap = self.gaps[0]
+            self.stop_gap  = (e1-t[-1]) / 60.
+            self.intervals.append( (int(t[-1]),e1) )
+        else:
+            self.start_gap = (e1-e0) / 60.
+            self.stop_gap  = 0.
+            self.intervals.append( (e0,e1) )
+
+        # Operating time (hours) at each QSO
+        self.cum_gap  = np.cumsum(np.where(off,self.gaps,0.))
+        self.op_times = ((t-e0)/60. - self.cum_gap) / 60.
+
+        self.duration = (e1-e0) / 60.
+        if len(t)>0:
+            self.total_off = self.cum_gap[-1] + self.stop_gap
+        else:
+            self.total_off = self.start_gap
+        self.op_time = self.duration - self.total_off
+
+    # Function to add a QSO made after the last one (e.g. in follow mode).
+    # Returns the operating time (hours) at the new QSO.
+    def add(self,epoch):
+        e0 = datetime_epoch(self.date0)
+        e1 = datetime_epoch(self.date1)
+        if len(self.epochs)>0:
+            last = int(self.epochs[-1])
+        else:
+            last = e0
+        gap = max(epoch-last,0) / 60.
+        off = gap>self.min_gap or len(self.epochs)==0
+        if off:
+            self.intervals[-1] = (last,epoch)
+            self.intervals.append( (epoch,e1) )
+        else:
+            self.intervals[-1] = (epoch,e1)
+        cum_gap = (self.cum_gap[-1] if len(self.cum_gap)>0 else 0.) + (gap if off else 0.)
+        op_time = ((epoch-e0)/60. - cum_gap) / 60.
+
+        self.epochs   = np.append(self.epochs,epoch)
+        self.gaps     = np.append(self.gaps,gap)
+        self.off      = np.append(self.off,off)
+        self.cum_gap  = np.append(self.cum_gap,cum_gap)
+        self.op_times = np.append(self.op_times,op_time)
+        if len(self.epochs)==1:
+            self.start_gap = gap
+        self.stop_gap  = (e1-epoch) / 60.
+        self.total_off = cum_gap + self.stop_gap
+        self.op_time   = self.duration - self.total_off
+        return op_time
+
+    # On time periods - whatever is left between the off times
+    def on_periods(self):
+        ivals = self.intervals
+        return [(ivals[k][1],ivals[k+1][0]) for k in range(len(ivals)-1)]
+
+    # Index of the first QSO after the operating time limit (hours) is exceeded
+    def cutoff(self,limit):
+        return int( np.searchsorted(self.op_times,limit,side='right') )
+
+    # Mask of QSOs made after the operating time limit (hours)
+    def over_limit(self,limit):
+        return self.op_times>limit
+
+    # Function to convert an epoch back to a datetime
+    def to_datetime(self,e):
+        return self.date0 + datetime.timedelta(seconds=int(e-datetime_epoch(self.date0)))
+
+    # Print out the time gaps
+    def print_gaps(self,qsos):
+        for i in np.flatnonzero(self.off[1:])+1:
+            print('\n%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% Time Gap %%%%%%%%%%%%%%%%%%%%%%%%%%%%%')
+            print('Time gap:',self.gaps[i],'minutes')
+            print(qsos[i]['time_stamp'],qsos[i]['call'],qsos[i-1]['call'])
+
+    # Text report
+    def report(self):
+        hrs  = int(self.op_time/60)
+        mins = int( self.op_time-60*hrs + 0.5 )
+        print('Start Date/Time:',self.date0)
+        print('End   Date/Time:',self.date1)
+        print('\nStart time gap:\t\t%8.1f minutes\t=%8.1f hours' % (self.start_gap,self.start_gap/60.) )
+        print('Stop time gap:\t\t%8.1f minutes\t=%8.1f hours'  % (self.stop_gap,self.stop_gap/60.) )
+        print('Total time off:\t\t%8.1f minutes\t=%8.1f hours' % (self.total_off,self.total_off/60.) )
+        print('Contest duration:\t%8.1f minutes \t=%8.1f hours' %(self.duration,self.duration/60.) )
+        print('Operating time:\t\t%8.1f minutes \t=%8.1f hours \t= %d:%d hours' %
+              (self.op_time,self.op_time/60.,hrs,mins) )
+        print('No. off periods:\t%8d' % (len(self.intervals)))
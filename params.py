@@ -19,22 +19,80 @@
 #
 ################################################################################
 
+import sys
+import os
+import time
+import datetime
 import argparse
+import importlib
 from settings import CONFIG_PARAMS
-import os
+from station_cache import set_cty_dir,load_dx_cty
+
+################################################################################
 
-from scoring import *
-from qsop import *
-from wwdigi import *
-from mak import *
-from cqww import *
-from arrl_dx import *
-from rac import *
-from colonies import *
-from satellites import *
-from call import *
-from foc import *
-from dx import load_cty_info
+# Registry of contests - command line flag -> (module, scoring class, lazy cty).
+# Only the module for the selected contest is imported.  Contests with lazy cty
+# look calls up via station_cache so the country info is only loaded if needed -
+# those scored by the libs always load it up front.
+CONTESTS = {
+    'mak'      : ('mak',        'MAKROTHEN_SCORING',       True),
+    'cwss'     : ('scoring',    'ARRL_SS_SCORING',         False),
+    'cqwwcw'   : ('cqww',       'CQ_WW_SCORING',           True),
+    'cqwwrtty' : ('cqww',       'CQ_WW_SCORING',           True),
+    'arrl_dx'  : ('arrl_dx',    'ARRL_INTL_DX_SCORING',    True),
+    'cq160m'   : ('scoring',    'ARRL_RTTY_RU_SCORING',    False),
+    'rttyru'   : ('scoring',    'ARRL_RTTY_RU_SCORING',    False),
+    'ftru'     : ('scoring',    'ARRL_RTTY_RU_SCORING',    False),
+    'ten'      : ('scoring',    'ARRL_RTTY_RU_SCORING',    False),
+    'vhf'      : ('scoring',    'VHF_SCORING',             False),
+    'cqvhf'    : ('scoring',    'VHF_SCORING',             False),
+    'vhfss'    : ('scoring',    'VHF_SCORING',             False),
+    'fall50'   : ('scoring',    'VHF_SCORING',             False),
+    'namss'    : ('scoring',    'VHF_SCORING',             False),
+    'fd'       : ('scoring',    'FIELD_DAY_SCORING',       False),
+    'sprint'   : ('scoring',    'SST_SCORING',             False),
+    'wwdigi'   : ('wwdigi',     'WWDIGI_SCORING',          True),
+    'cwt'      : ('scoring',    'CWT_SCORING',             False),
+    'cwopen'   : ('scoring',    'CWOPEN_SCORING',          False),
+    'mst'      : ('scoring',    'MST_SCORING',             False),
+    'sst'      : ('scoring',    'SST_SCORING',             False),
+    'foc'      : ('foc',        'FOCBW_SCORING',           True),
+    'rac'      : ('rac',        'RAC_SCORING',             True),
+    'ocdx'     : ('rac',        'RAC_SCORING',             True),
+    'call'     : ('call',       'SPECIFIC_CALL',           True),
+    'cols13'   : ('colonies',   'THIRTEEN_COLONIES_SES',   True),
+    'sats'     : ('satellites', 'SATCOM',                  True),
+    'naqpcw'   : ('scoring',    'NAQP_SCORING',            False),
+    'naqprtty' : ('scoring',    'NAQP_SCORING',            False),
+    'state'    : ('qsop',       'QSOP_SCORING',            True),
+    'cqmm'     : ('scoring',    'CQ_WPX_SCORING',          False),
+    'wpxcw'    : ('scoring',    'CQ_WPX_SCORING',          False),
+    'wpxrtty'  : ('scoring',    'CQ_WPX_SCORING',          False),
+    'iaru'     : ('scoring',    'IARU_HF_SCORING',         False),
+    'cqp'      : ('scoring',    'CQP_SCORING',             False),
+}
+
+# Time taken to import each module - reported with -timing
+IMPORT_TIMES = {}
+
+################################################################################
+
+# Function to import the scoring class for a contest
+def contest_class(flag):
+    module,name,lazy = CONTESTS[flag]
+    if module not in IMPORT_TIMES:
+        t0=time.perf_counter()
+        importlib.import_module(module)
+        IMPORT_TIMES[module]=time.perf_counter()-t0
+    return getattr(sys.modules[module],name)
+
+# Function to check the -follow poll interval - 0 would turn follow mode off
+# (and poll non-stop if it didn't)
+def poll_interval(txt):
+    secs=int(txt)
+    if secs<1:
+        raise argparse.ArgumentTypeError('poll interval must be at least 1 sec - got '+txt)
+    return secs
 
 ################################################################################
 
@@ -89,8 +147,21 @@ class PARAMS:
                               help='Dont plot rate graph')
         arg_proc.add_argument('-notrap', action='store_true',
                               help='Dont Trap Errors')
+        arg_proc.add_argument('-nocache', action='store_true',
+                              help='Dont use/update saved index of ADIF logs & history snapshot')
+        arg_proc.add_argument('-parallel', action='store_true',
+                              help='Read input files in parallel')
         arg_proc.add_argument('-assisted', action='store_true',
                               help='Used assitance (cluster, etc.)')
+        arg_proc.add_argument('-timing', action='store_true',
+                              help='Report import & start-up times')
+        arg_proc.add_argument('-table', action='store_true',
+                              help='Check batch (table) scoring against QSO by QSO scoring')
+        arg_proc.add_argument('-query', action='store_true',
+                              help='Answer BAND CALL [EXCH] queries from stdin after scoring')
+        arg_proc.add_argument('-follow', nargs='?', type=poll_interval, const=5, default=None,
+                              metavar='SECS',
+                              help='Keep scoring QSOs as they are added to the log(s), polling every SECS sec (default 5) - no graphs')
         arg_proc.add_argument("-i", help="Input ADIF file(s)",
                               nargs='*',type=str,default=None)
         arg_proc.add_argument("-limit", help="Time Limit (Hours)",
@@ -122,6 +193,14 @@ class PARAMS:
         self.TRAP_ERRORS   = not args.notrap
         self.ASSISTED      = args.assisted
         self.RATE_GRAPH    = not args.nograph
+        self.LOG_CACHE     = not args.nocache
+        self.QSO_TABLE     = args.table
+        self.QUERY         = args.query
+        self.FOLLOW        = args.follow
+        if self.FOLLOW:
+            self.RATE_GRAPH = False
+        self.PARALLEL      = args.parallel
+        self.TIMING        = args.timing
 
         P=CONFIG_PARAMS('.keyerrc')
         P.gui=None
@@ -137,7 +216,7 @@ class PARAMS:
         self.HIST_DIR=os.path.expanduser(DATA_DIR+'/')
         self.HIST_DIR2 = os.path.expanduser('~/Python/history/data/')
         self.output_file = args.o.replace('MY_CALL',MY_CALL)
-        load_cty_info(DIR=DATA_DIR)
+        set_cty_dir(DATA_DIR)
 
         DIR_NAME=""
 
@@ -145,7 +224,7 @@ class PARAMS:
 
         # Contest-specific stuff
         if args.mak:
-            sc = MAKROTHEN_SCORING(P)
+            sc = contest_class('mak')(P)
             self.sc=sc
             
             contest=sc.contest
@@ -159,7 +238,7 @@ class PARAMS:
             fname = 'AA2IL.adif'
 
         elif args.rttyru:
-            sc = ARRL_RTTY_RU_SCORING(P,'ARRL-RTTY')
+            sc = contest_class('rttyru')(P,'ARRL-RTTY')
             #self.sc=sc
             
             contest=sc.contest
@@ -180,7 +259,7 @@ class PARAMS:
         elif args.ftru:
 
             # FT Round-up in December
-            sc = ARRL_RTTY_RU_SCORING(P,'FT8-RU')
+            sc = contest_class('ftru')(P,'FT8-RU')
             self.sc=sc
             
             self.history = self.HIST_DIR+'master.csv'
@@ -193,7 +272,7 @@ class PARAMS:
         elif args.ten:
 
             # ARRL 10m contest
-            sc = ARRL_RTTY_RU_SCORING(P,'ARRL-10',self.TRAP_ERRORS)
+            sc = contest_class('ten')(P,'ARRL-10',self.TRAP_ERRORS)
             self.sc=sc
             self.history = self.HIST_DIR+'master.csv'
             
@@ -205,7 +284,7 @@ class PARAMS:
         elif args.cq160m:
 
             # CQ 160m contest
-            sc = ARRL_RTTY_RU_SCORING(P,'CQ-160')
+            sc = contest_class('cq160m')(P,'CQ-160')
             self.sc=sc
             
             fname = 'AA2IL.adif'
@@ -229,7 +308,7 @@ class PARAMS:
                 print('\n*** ERROR - Invalid sponser ***\n')
                 sys.exit(0)
                 
-            sc = VHF_SCORING(P,org,self.TRAP_ERRORS)
+            sc = contest_class('vhf')(P,org,self.TRAP_ERRORS)
             self.sc=sc
             DIR_NAME = ''
 
@@ -247,7 +326,7 @@ class PARAMS:
         elif args.fd:
 
             # Winter or ARRL Field Day
-            sc = FIELD_DAY_SCORING(P,self.TRAP_ERRORS)
+            sc = contest_class('fd')(P,self.TRAP_ERRORS)
             self.sc=sc
             DIR_NAME = ''
 
@@ -270,7 +349,7 @@ class PARAMS:
             """
             
         elif args.wwdigi:
-            sc = WWDIGI_SCORING(P)
+            sc = contest_class('wwdigi')(P)
             self.sc=sc
 
             DIR_NAME = '~/.local/share/WSJT-X - CONTEST'
@@ -278,7 +357,7 @@ class PARAMS:
             fname = 'wsjtx_log.adi'
 
         elif args.cwss:
-            sc = ARRL_SS_SCORING(P,self.TRAP_ERRORS)
+            sc = contest_class('cwss')(P,self.TRAP_ERRORS)
             self.sc=sc
             
             #fname = 'AA2IL.adif'
@@ -293,7 +372,7 @@ class PARAMS:
         elif args.naqprtty:
 
             # North American QSO Party RTTY
-            sc = NAQP_SCORING(P,'NAQP-RTTY',self.TRAP_ERRORS)
+            sc = contest_class('naqprtty')(P,'NAQP-RTTY',self.TRAP_ERRORS)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -311,7 +390,7 @@ class PARAMS:
         elif args.naqpcw:
 
             # North American QSO Party CW
-            sc = NAQP_SCORING(P,'NAQP-CW',self.TRAP_ERRORS)
+            sc = contest_class('naqpcw')(P,'NAQP-CW',self.TRAP_ERRORS)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -327,7 +406,7 @@ class PARAMS:
         elif args.state:
 
             # State QSO Party
-            sc = QSOP_SCORING(P,'CW',args.state)
+            sc = contest_class('state')(P,'CW',args.state)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -338,7 +417,7 @@ class PARAMS:
         elif args.arrl_dx:
 
             # ARRL Internationl DX 
-            sc = ARRL_INTL_DX_SCORING(P)
+            sc = contest_class('arrl_dx')(P)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -349,7 +428,7 @@ class PARAMS:
         elif args.cqwwcw:
 
             # CQ World Wide CW
-            sc = CQ_WW_SCORING(P,'CW')
+            sc = contest_class('cqwwcw')(P,'CW')
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -363,7 +442,7 @@ class PARAMS:
         elif args.cqwwrtty:
             
             # CQ World Wide RTTY
-            sc = CQ_WW_SCORING(P,'RTTY')
+            sc = contest_class('cqwwrtty')(P,'RTTY')
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -385,7 +464,7 @@ class PARAMS:
             else:
                 MODE='RTTY'
                 NAME='WPX'
-            sc = CQ_WPX_SCORING(P,MODE,NAME,self.TRAP_ERRORS)
+            sc = contest_class('wpxcw')(P,MODE,NAME,self.TRAP_ERRORS)
             self.sc=sc
             self.history = self.HIST_DIR+'master.csv'
             
@@ -403,7 +482,7 @@ class PARAMS:
 
             # IARU HF Champs
             #sc = IARU_HF_SCORING(P)
-            sc = IARU_HF_SCORING(self)
+            sc = contest_class('iaru')(self)
             self.sc=sc
             self.history = sc.history
             fname = sc.fname
@@ -412,7 +491,7 @@ class PARAMS:
         elif args.cqp:
 
             # California QSO Party
-            sc = CQP_SCORING(P,self.TRAP_ERRORS)
+            sc = contest_class('cqp')(P,self.TRAP_ERRORS)
             self.sc=sc
             
             self.history = self.HIST_DIR+'master.csv'
@@ -437,7 +516,7 @@ class PARAMS:
             else:
                 P.TXT='RAC'
             
-            sc = RAC_SCORING(P)
+            sc = contest_class('rac')(P)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -451,7 +530,7 @@ class PARAMS:
         elif args.sst:
 
             # K1USN SST
-            sc = SST_SCORING(P,'SST')
+            sc = contest_class('sst')(P,'SST')
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -461,7 +540,7 @@ class PARAMS:
         elif args.sprint:
 
             # NS and NCJ sprint
-            sc = SST_SCORING(P,'SPRINT')
+            sc = contest_class('sprint')(P,'SPRINT')
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -471,7 +550,7 @@ class PARAMS:
         elif args.foc:
 
             # FOC BW
-            sc = FOCBW_SCORING(P,'SPRINT')
+            sc = contest_class('foc')(P,'SPRINT')
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -487,7 +566,7 @@ class PARAMS:
             else:
                 session=None
                 
-            sc = CWT_SCORING(self,session)
+            sc = contest_class('cwt')(self,session)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -501,7 +580,7 @@ class PARAMS:
                 session=args.cwopen[0]
             else:
                 session=None
-            sc = CWOPEN_SCORING(P,session)
+            sc = contest_class('cwopen')(P,session)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -519,7 +598,7 @@ class PARAMS:
             else:
                 session=None
         
-            sc = MST_SCORING(P,session)
+            sc = contest_class('mst')(P,session)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -529,7 +608,7 @@ class PARAMS:
         elif args.cols13:
 
             # 13 Colonies special event
-            sc=THIRTEEN_COLONIES_SES(P)
+            sc=contest_class('cols13')(P)
             self.sc=sc
 
             #contest=sc.contest
@@ -557,7 +636,7 @@ class PARAMS:
         elif args.sats:
 
             # Satellites
-            sc = SATCOM(P)
+            sc = contest_class('sats')(P)
             self.sc=sc
 
             #self.history = ''
@@ -579,7 +658,7 @@ class PARAMS:
                 sys.exit(0)                
 
             # Specific call
-            sc = SPECIFIC_CALL(P,calls)
+            sc = contest_class('call')(P,calls)
             self.sc=sc
 
             self.history = self.HIST_DIR+'master.csv'
@@ -590,6 +669,12 @@ class PARAMS:
             print('Need to specify a single contest')
             sys.exit(0)
 
+        # Country info is loaded on first use by the contests that look calls up
+        # via station_cache - those scored by the libs may need it right away
+        flags = [c for c in CONTESTS if vars(args)[c] not in [None,False]]
+        if not all( CONTESTS[c][2] for c in flags ):
+            load_dx_cty()
+
         print('DIR_NAME=',DIR_NAME,'\tfnames=',fnames,'\t',type(fnames))
         if type(fnames) == list:   
             self.input_files  = fnames
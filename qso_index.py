@@ -0,0 +1,58 @@
+############################################################################################
+#
+# qso_index.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Index of the contest QSOs by call.  Built once after the QSOs have been read in so
+# that listing all of the QSOs with a call (busted calls, live dupe checks) only looks
+# at that station's QSOs instead of the whole log.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+from collections import defaultdict
+from timestamps import cabrillo_date_time
+
+############################################################################################
+
+# Index of QSOs by call - maps each call to the list of its QSO indices, in time order
+class QSO_INDEX:
+
+    def __init__(self,qsos):
+        self.qsos  = qsos
+        self.calls = defaultdict(list)
+        for i,rec in enumerate(qsos):
+            self.calls[rec['call'].upper()].append(i)
+
+    # Function to add a QSO that's been appended to the list
+    def add(self,i):
+        self.calls[self.qsos[i]['call'].upper()].append(i)
+
+    # Indices of all QSOs with a call
+    def indices(self,call):
+        return self.calls.get(call.upper(),[])
+
+    # All QSOs with a call
+    def all_qsos(self,call):
+        return [self.qsos[i] for i in self.indices(call)]
+
+    # Function to print out all QSOs with a call
+    def list_all_qsos(self,call):
+        print('All QSOs with',call,':')
+        for i in self.indices(call):
+            rec=self.qsos[i]
+            date_off,time_off = cabrillo_date_time(rec)
+            exch=rec.get('srx_string',rec.get('qth',''))
+            print('%6d %s %s %-10s %5s %-5s %s' %
+                  (i+1,date_off,time_off,rec['call'],rec.get('band',''),rec.get('mode',''),exch))
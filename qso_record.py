@@ -0,0 +1,148 @@
+############################################################################################
+#
+# qso_record.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Compact QSO record.  The ADIF tags the scorers actually use are kept in slots and
+# anything else goes into a small overflow list.  Records still act like the dicts
+# they replace - rec['call'], 'qth' in rec, rec.get(...), rec[tag]=... all work - so
+# none of the scorers need to know the difference.  The frequency in kHz & the time
+# stamp in seconds since 1970 are also available as attributes.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import sys
+from collections.abc import MutableMapping
+from adif_reader import datetime_epoch
+
+############################################################################################
+
+# Tags that get their own slot - everything else goes in the overflow list
+TAGS = ('call','band','freq','mode','qso_date','time_on','qso_date_off','time_off',
+        'srx_string','stx_string','srx','stx','rst_rcvd','rst_sent',
+        'qth','name','state','gridsquare','contest_id',
+        'time_stamp','cbr_date','cbr_time','source_file')
+TAG_SET = frozenset(TAGS)
+
+# Tags that only take on a handful of values - these are interned
+INTERNED = frozenset(('band','mode','contest_id','rst_rcvd','rst_sent',
+                      'qso_date','qso_date_off','state','source_file'))
+
+# Short values of the extra tags are interned too - things like my_gridsquare,
+# station_callsign & tx_pwr are usually the same for every QSO
+MAX_INTERN = 16
+
+############################################################################################
+
+# Overflow tag names are shared between records - most records from the same
+# logger have the same set of extra tags
+KEY_TUPLES = {}
+
+def shared_keys(keys):
+    return KEY_TUPLES.setdefault(keys,keys)
+
+# QSO record - a slotted stand-in for the dict of ADIF tags
+class QSO_RECORD(MutableMapping):
+
+    __slots__ = TAGS + ('freq_khz','epoch','extra_keys','extra_vals')
+
+    def __init__(self,rec=None):
+        self.freq_khz   = None
+        self.epoch      = None
+        self.extra_keys = ()
+        self.extra_vals = None
+        if rec:
+            extra=[]
+            for tag,val in rec.items():
+                if tag in TAG_SET:
+                    self[tag]=val
+                else:
+                    if type(val) is str and len(val)<=MAX_INTERN:
+                        val=sys.intern(val)
+                    extra.append( (tag,val) )
+            if extra:
+                self.extra_keys = shared_keys( tuple([t for t,v in extra]) )
+                self.extra_vals = [v for t,v in extra]
+
+    def __getitem__(self,tag):
+        if tag in TAG_SET:
+            try:
+                return getattr(self,tag)
+            except AttributeError:
+                raise KeyError(tag)
+        try:
+            return self.extra_vals[self.extra_keys.index(tag)]
+        except ValueError:
+            raise KeyError(tag)
+
+    def __setitem__(self,tag,val):
+        if tag in TAG_SET:
+            if tag in INTERNED and type(val) is str:
+                val=sys.intern(val)
+            setattr(self,tag,val)
+            if tag=='freq':
+                try:
+                    self.freq_khz = int( 1000*float(val) +0.5 )
+                except (TypeError,ValueError):
+                    self.freq_khz = None
+            elif tag=='time_stamp':
+                self.epoch = datetime_epoch(val)
+        elif tag in self.extra_keys:
+            self.extra_vals[self.extra_keys.index(tag)]=val
+        else:
+            self.extra_keys = shared_keys( self.extra_keys+(tag,) )
+            if self.extra_vals==None:
+                self.extra_vals=[]
+            self.extra_vals.append(val)
+
+    def __delitem__(self,tag):
+        if tag in TAG_SET:
+            try:
+                delattr(self,tag)
+            except AttributeError:
+                raise KeyError(tag)
+        elif tag in self.extra_keys:
+            i=self.extra_keys.index(tag)
+            self.extra_keys = shared_keys( self.extra_keys[:i]+self.extra_keys[i+1:] )
+            del self.extra_vals[i]
+        else:
+            raise KeyError(tag)
+
+    def __contains__(self,tag):
+        if tag in TAG_SET:
+            return hasattr(self,tag)
+        return tag in self.extra_keys
+
+    def __iter__(self):
+        for tag in TAGS:
+            if hasattr(self,tag):
+                yield tag
+        yield from self.extra_keys
+
+    def __len__(self):
+        return sum(1 for tag in TAGS if hasattr(self,tag)) + len(self.extra_keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self):
+        return QSO_RECORD(self)
+
+    # Pickling - needed when the logs are read in parallel
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self,state):
+        self.__init__(state)
@@ -0,0 +1,87 @@
+############################################################################################
+#
+# qso_table.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Columnar (pandas) view of the contest QSOs.  Built once after the scoring loop so
+# that contests with a score_table() routine can compute points, mults and band
+# counts with group-bys.  The regular qso_scoring() path is the reference - the two
+# are compared to make sure they agree.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import time
+import numpy as np
+import pandas as pd
+from station_cache import get_station
+
+############################################################################################
+
+# Function to build the QSO table.  dupes & scored are boolean arrays from the
+# scoring loop - QSOs that were skipped (e.g. rapid dupes) are not scored.
+def qso_table(qsos,dupes=None,scored=None):
+
+    n=len(qsos)
+    df=pd.DataFrame({
+        'call'       : [rec['call'] for rec in qsos],
+        'band'       : pd.Categorical([rec.get('band','') for rec in qsos]),
+        'mode'       : pd.Categorical([rec.get('mode','') for rec in qsos]),
+        'freq_khz'   : [rec.freq_khz for rec in qsos],
+        'epoch'      : np.array([rec.epoch for rec in qsos],dtype=np.int64),
+        'qth'        : [rec.get('qth','') for rec in qsos],
+        'srx_string' : [rec.get('srx_string','') for rec in qsos],
+    })
+    df['dupe']   = np.zeros(n,dtype=bool) if dupes is None else np.asarray(dupes,dtype=bool)
+    df['scored'] = np.ones(n,dtype=bool) if scored is None else np.asarray(scored,dtype=bool)
+
+    # Country info - one lookup per unique call
+    calls=df['call'].unique()
+    stations=[get_station(c) for c in calls]
+    for col in ['country','continent','cqz']:
+        m=dict( zip(calls,[getattr(s,col) for s in stations]) )
+        df[col]=df['call'].map(m)
+
+    return df
+
+# Function to pull out the QSOs that count
+def scored_qsos(df):
+    return df[df['scored'] & ~df['dupe']]
+
+# Function to sum up a column by band
+def by_band(df,col,bands,how='sum'):
+    g=df.groupby('band',observed=True)[col]
+    if how=='nunique':
+        s=g.nunique(dropna=False)
+    elif how=='size':
+        s=g.size()
+    else:
+        s=g.sum()
+    return {b:int(s.get(b,0)) for b in bands}
+
+# Function to compare the batch (table) score with the reference one
+def check_score_table(sc,df):
+    t0=time.perf_counter()
+    batch=sc.score_table(df)
+    t1=time.perf_counter()
+    ref=sc.reference_totals()
+
+    diffs=[k for k in ref if ref[k]!=batch.get(k)]
+    if len(diffs)==0:
+        print('\nBatch scoring agrees with QSO scoring (%.3f sec)' % (t1-t0))
+    else:
+        print('\n*** Batch scoring DIFFERS from QSO scoring ***')
+        for k in diffs:
+            print('   ',k,':\treference=',ref[k],'\tbatch=',batch.get(k))
+    return len(diffs)==0
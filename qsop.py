@@ -26,6 +26,9 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
+from timestamps import cabrillo_date_time
+from exchanges import EXCHANGE_TRACKER
+from live import LIVE_QUERY
 from counties import *
 
 ############################################################################################
@@ -38,7 +41,7 @@ VERBOSITY=0
 ############################################################################################
     
 # Scoring class for state QSP parties
-class QSOP_SCORING(CONTEST_SCORING):
+class QSOP_SCORING(CONTEST_SCORING,LIVE_QUERY):
  
     def __init__(self,P,MODE,STATE):
 
@@ -48,6 +51,10 @@ class QSOP_SCORING(CONTEST_SCORING):
             contest_name=STATE+'-QSO-PARTY'
         
         CONTEST_SCORING.__init__(self,P,contest_name,mode=MODE)
+
+        # History columns to load up front - anything else is loaded if its used
+        self.HIST_FIELDS = ['state','sec','county']
+        self.EXCHANGES  = EXCHANGE_TRACKER()
         print('State QSO Party Scoring - ',STATE)
 
         self.MY_CALL     = P.SETTINGS['MY_CALL']
@@ -92,6 +99,11 @@ class QSOP_SCORING(CONTEST_SCORING):
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
         self.band_cnt = np.zeros((len(self.BANDS)),dtype=int)
         self.sec_cnt = np.zeros((len(self.COUNTIES),),dtype=int)
+
+        # County -> index lookup & counties worked on each band
+        self.COUNTY_INDEX = {c:i for i,c in enumerate(self.COUNTIES)}
+        self.worked = np.zeros((len(self.BANDS),len(self.COUNTIES)),dtype=bool)
+        self.nmults = 0
         self.TRAP_ERRORS = TRAP_ERRORS
 
         # Manual override
@@ -114,7 +126,6 @@ class QSOP_SCORING(CONTEST_SCORING):
         if VERBOSITY>0:
             print('rec=',rec)
             #sys.exit(0)
-        keys=list(HIST.keys())
 
         # Check for correct contest
         id   = rec["contest_id"].upper()
@@ -135,10 +146,9 @@ class QSOP_SCORING(CONTEST_SCORING):
         except:
             srx = rec["srx_string"].upper().split(',')
             qth = srx[1]
-        freq_khz = int( 1000*float(rec["freq"]) +0.5 )
+        freq_khz = rec.freq_khz
         band = rec["band"]
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        date_off,time_off = cabrillo_date_time(rec)
         if MY_MODE=='CW':
             mode='CW'
         else:
@@ -166,10 +176,12 @@ class QSOP_SCORING(CONTEST_SCORING):
                         if self.STATE=='W7' and len(qth2)>1 and len(qth1)==3:
                             print('WARNING - Fixup applied for qth1=',qth1)
                             qth1=qth2[0][0:2] + qth1
-                        idx1 = self.COUNTIES.index(qth1)
-                        self.sec_cnt[idx1] = 1
-                        self.MULTS.append(qth1)
-                        #self.sec_cnt[idx1,idx2] = 1
+                        idx1 = self.COUNTY_INDEX[qth1]
+                        if self.sec_cnt[idx1]==0:
+                            self.sec_cnt[idx1] = 1
+                            self.nmults += 1
+                            self.MULTS.append(qth1)
+                        self.worked[idx2,idx1] = True
                 else:
                     print('Consider adding list of counties for this party!\t',qth)
                     sys,exit(0)
@@ -179,17 +191,14 @@ class QSOP_SCORING(CONTEST_SCORING):
                 print('call=',call,'\tqth=',qth,' not found in list of Counties')
                 print('counties=',self.COUNTIES)
                 print('rec=',rec)
-                self.list_all_qsos(call,qsos)
+                self.qso_index.list_all_qsos(call)
                 print('$$$$$$$$$$$$$$$$$$$$$$')
                 if TRAP_ERRORS:
                     sys.exit(0)
     
             # Info for multi-qsos
             exch_in=qth
-            if call in self.EXCHANGES.keys():
-                self.EXCHANGES[call].append(exch_in)
-            else:
-                self.EXCHANGES[call]=[exch_in]
+            self.EXCHANGES.add(call,exch_in)
 
         line=[]
         qth2=qth.split('/')
@@ -197,7 +206,7 @@ class QSOP_SCORING(CONTEST_SCORING):
             if self.STATE=='W7' and len(qth2)>1 and len(qth1)==3:
                 print('WARNING - Fixup applied for qth1=',qth1)
                 qth1=qth2[0][0:2] + qth1
-            if qth1 in self.COUNTIES:
+            if qth1 in self.COUNTY_INDEX:
                 line.append(
                     'QSO: %5d %2s %10s %4s %-10s      %-10s %-3s %-10s      %-10s %-3s' % \
                     (freq_khz,mode,date_off,time_off, \
@@ -220,7 +229,7 @@ class QSOP_SCORING(CONTEST_SCORING):
         """
 
         # Check against history
-        if call in keys and True:
+        if call in HIST and True:
             state=HIST[call]['state']
             if state=='':
                 sec  =HIST[call]['sec']
@@ -247,27 +256,55 @@ class QSOP_SCORING(CONTEST_SCORING):
         #sys.exit(0)
         return line
             
-    # Summary & final tally
-    def summary(self):
-
-        self.MULTS = list( set( self.MULTS ))
-        mults = self.sec_cnt
+    # Points per QSO - each county on a county line counts as a QSO
+    def pts_per_qso(self):
         if self.STATE in ['IL','NY']:
-            pts_per_qso=2
+            return 2
         elif self.STATE=='W7':
-            pts_per_qso=3
+            return 3
         elif self.STATE=='W1':
-            pts_per_qso=2
+            return 2
         else:
-            pts_per_qso=1
+            return 1
+
+    # What a QSO would be worth - see live.py.  exch is the county (or county line,
+    # e.g. 'ALB/REN') - if not given, we go by what we got last time.
+    def qso_value(self,band,call,exch=None):
+        if not exch:
+            exch = self.last_exchange(call)
+            if not exch:
+                return 0,[]
+        qth2=exch.upper().split('/')
+        qso_points=0
+        new_mults=[]
+        for qth1 in qth2:
+            if self.STATE=='W7' and len(qth2)>1 and len(qth1)==3:
+                qth1=qth2[0][0:2] + qth1
+            idx1 = self.COUNTY_INDEX.get(qth1)
+            if idx1!=None:
+                qso_points += self.pts_per_qso()
+                if self.sec_cnt[idx1]==0 and qth1 not in new_mults:
+                    new_mults.append(qth1)
+        return qso_points,new_mults
+
+    # Total points & mults so far
+    def score_totals(self):
+        return self.nqsos2*self.pts_per_qso(),self.nmults
+
+    # Summary & final tally
+    def summary(self):
+
+        mults = self.sec_cnt
+        pts_per_qso = self.pts_per_qso()
         
         print('\nNo. QSOs        =',self.nqsos1)
         print('No. Uniques     =',self.nqsos2)
         print('No. Skipped     =',self.nskipped)
-        print('\nBand\tQSOs')
+        print('\nBand\tQSOs\tMults')
+        band_mults = np.count_nonzero(self.worked,axis=1)
         for i in range(len(self.BANDS)):
-            print(self.BANDS[i],'\t',self.band_cnt[i])
+            print(self.BANDS[i],'\t',self.band_cnt[i],'\t',band_mults[i])
         print('\nQSOs            =',self.nqsos2)
-        print('Mults           =',sum(mults),'\t',self.MULTS,
+        print('Mults           =',self.nmults,'\t',self.MULTS,
               '\t',len(self.MULTS),'/',len(self.COUNTIES))
-        print('Claimed score=',sum(mults)*self.nqsos2*pts_per_qso)
+        print('Claimed score=',self.nmults*self.nqsos2*pts_per_qso)
@@ -27,7 +27,10 @@ import sys
 import datetime
 from rig_io.ft_tables import PROVINCES2,THIRTEEN_COLONIES
 from scoring import CONTEST_SCORING
-from dx.spot_processing import Station
+from timestamps import cabrillo_date_time
+from exchanges import EXCHANGE_TRACKER
+from live import LIVE_QUERY
+from station_cache import get_dx_station,station_cache_report
 from pprint import pprint
 from utilities import reverse_cut_numbers,Oh_Canada
 import numpy as np
@@ -41,7 +44,7 @@ TRAP_ERRORS = True
 ############################################################################################
     
 # Scoring class for RAC & OC DX - Inherits the base contest scoring class
-class RAC_SCORING(CONTEST_SCORING):
+class RAC_SCORING(CONTEST_SCORING,LIVE_QUERY):
  
     def __init__(self,P):
         # Determine contest 
@@ -56,6 +59,13 @@ class RAC_SCORING(CONTEST_SCORING):
 
         super().__init__(P,P.TXT,mode='CW')
 
+        # History columns to load up front - only count_cwops uses the history
+        self.HIST_FIELDS = []
+
+        # What makes a QSO unique - see dupes.py
+        self.DUPE_RULES = {'key':('call','band','mode')}         # Once per band & mode
+        self.EXCHANGES  = EXCHANGE_TRACKER()
+
         # NOTE - RAC also has CANADA-DAY contest in the summer, same deal
         
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
@@ -130,7 +140,6 @@ class RAC_SCORING(CONTEST_SCORING):
     # Scoring routine for RAC Winter contest
     def qso_scoring(self,rec,dupe,qsos,HIST,MY_MODE,HIST2):
         #print('\nrec=',rec)
-        keys=list(HIST.keys())
 
         # Check for correct contest
         if "contest_id" in rec:
@@ -154,12 +163,11 @@ class RAC_SCORING(CONTEST_SCORING):
 
         # Pull out relavent entries
         call = rec["call"].upper()
-        freq_khz = int( 1000*float(rec["freq"]) +0.5 )
+        freq_khz = rec.freq_khz
         rx   = rec["srx_string"].strip().upper().split(',')
         tx   = rec["stx_string"].strip().upper().split(',')
 
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
+        date_off,time_off = cabrillo_date_time(rec)
         if MY_MODE=='CW':
             mode='CW'
         else:
@@ -175,7 +183,7 @@ class RAC_SCORING(CONTEST_SCORING):
             print('Date   =',rec["qso_date_off"])
             print('Time   =',rec["time_off"])
             print('rec=',rec)
-            self.list_all_qsos(call,qsos)
+            self.qso_index.list_all_qsos(call)
             if TRAP_ERRORS:
                 sys.exit(0)
 
@@ -185,7 +193,7 @@ class RAC_SCORING(CONTEST_SCORING):
             return
                 
         # Check country - Canadian stations are worth many more pts in RAC contests
-        dx_station = Station(call)
+        dx_station = get_dx_station(call)
         if False:
             pprint(vars(dx_station))
             sys.exit(0)
@@ -278,10 +286,7 @@ class RAC_SCORING(CONTEST_SCORING):
         # Info for multi-qsos
         if self.RAC and country=='Canada':
             exch_in=rst_in+' '+qth
-            if call in self.EXCHANGES.keys():
-                self.EXCHANGES[call].append(exch_in)
-            else:
-                self.EXCHANGES[call]=[exch_in]
+            self.EXCHANGES.add(call,exch_in)
                         
         # Count no. of CWops guys worked
         self.count_cwops(call,HIST,rec)
@@ -299,6 +304,41 @@ class RAC_SCORING(CONTEST_SCORING):
         
         return line
                         
+    # What a QSO would be worth - see live.py.  exch is the province for
+    # Canadian stations - if not given, we go by what we got last time or the call.
+    def qso_value(self,band,call,exch=None):
+        dx_station = get_dx_station(call)
+        if not (self.RAC and dx_station.country=='Canada'):
+            if self.RAC:
+                return 2,[]
+            else:
+                return 1,[]
+
+        if 'RAC' in call:
+            qso_points = 20
+        else:
+            qso_points = 10
+        if exch:
+            qth = exch.replace(',',' ').upper().split()[-1]
+        else:
+            exch = self.last_exchange(call)
+            if exch:
+                qth = exch.split()[-1]
+            else:
+                qth,junk = Oh_Canada(dx_station)
+
+        new_mults=[]
+        if qth in PROVINCES2:
+            idx1 = self.BANDS.index(band)
+            idx2 = PROVINCES2.index(qth)
+            if self.sec_cnt[idx1,idx2]==0:
+                new_mults.append(qth)
+        return qso_points,new_mults
+
+    # Total points & mults so far
+    def score_totals(self):
+        return self.total_points,int( np.sum(self.sec_cnt) )
+                        
     # Summary & final tally
     def summary(self):
 
@@ -337,3 +377,5 @@ class RAC_SCORING(CONTEST_SCORING):
               int( (100.*self.num_running)/self.nqsos1+0.5),'%')
         print('No. QSOs S&P      =',self.num_sandp,' =',
               int( (100.*self.num_sandp)/self.nqsos1+0.5),'%')
+
+        station_cache_report()
@@ -0,0 +1,107 @@
+############################################################################################
+#
+# rates.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# QSO rate calculations - rolling window rate, instantaneous rate and the smoothed
+# rate on a 1-minute grid are all computed from the array of QSO time stamps with a
+# handful of NumPy operations.  Used for the rate graph and the rate report.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import datetime
+import numpy as np
+from adif_reader import datetime_epoch
+
+############################################################################################
+
+RATE_WINDOW = 10                    # Minutes
+NSMOOTH     = 11                    # Length of smoothing filter (minutes)
+
+############################################################################################
+
+# QSO rates for a contest.  epochs are the (sorted) QSO times in seconds since 1970.
+# All times below are in hours.  The first entry of times, rates, time_cw, times5
+# and dts is for the start of the contest, just as the rate graph has always had.
+class QSO_RATES:
+
+    def __init__(self,epochs,modes,date0,window=RATE_WINDOW):
+
+        t  = np.asarray(epochs,dtype=np.int64)
+        e0 = datetime_epoch(date0)
+        n  = len(t)
+        self.window = window
+        self.date0  = date0
+        self.epochs = t
+
+        # No. QSOs in the window ending at each QSO (including that QSO)
+        j = np.searchsorted(t,t-60*window,side='left')
+        self.nwindow = np.arange(n)-j+1
+        qrate = self.nwindow / (window/60.)
+
+        # Rolling rate vs. time from first QSO
+        if n>0:
+            dt = (t[1:]-t[0])/3600.
+        else:
+            dt = np.zeros(0)
+        cw = np.array([m=='CW' for m in modes[1:]],dtype=bool)
+        self.times   = np.concatenate( ([0],dt) )
+        self.rates   = np.concatenate( ([0],qrate[1:]) )
+        self.time_cw = np.concatenate( ([0],np.where(cw,dt,np.nan)) )
+
+        # Instantaneous rate vs. time from start of contest
+        self.times5 = np.concatenate( ([0],(t-e0)/3600.) )
+        self.dts    = np.concatenate( ([10*60],np.diff(np.concatenate( ([e0],t) ))) )
+        with np.errstate(divide='ignore'):
+            self.rate_inst = 3600./self.dts
+
+        # Resample the instantaneous rate on a 1-minute grid & smooth it out
+        self.tend   = self.times[-1]
+        self.times2 = np.arange(0,self.tend,1./60.)
+        idx = np.searchsorted(self.times5,self.times2,side='right')-1
+        self.rates2 = self.rate_inst[idx]
+        h=np.ones(NSMOOTH)/float(NSMOOTH)
+        if len(self.rates2)>0:
+            self.rates3 = np.convolve(self.rates2,h,'same')
+        else:
+            self.rates3 = np.zeros(0)
+
+        if self.tend>3:
+            self.tscale=1.
+            self.lab='Hours'
+        else:
+            self.tscale=60.
+            self.lab='Minutes'
+
+    # Peak no. of QSOs in any window of the given length (minutes) & when it ended
+    def peak(self,mins):
+        t = self.epochs
+        if len(t)==0:
+            return 0,None
+        cnt = np.arange(len(t)) - np.searchsorted(t,t-60*mins,side='left') + 1
+        i = int( np.argmax(cnt) )
+        return int(cnt[i]),self.date0 + datetime.timedelta(seconds=int(t[i]-datetime_epoch(self.date0)))
+
+    # Text report
+    def report(self):
+        print('\nQSO Rates:')
+        for mins in [self.window,60]:
+            n,t=self.peak(mins)
+            print('   Peak %3d-min rate:\t%8.1f per hour\t(%d QSOs ending %s)' %
+                  (mins,n*60./mins,n,t))
+        # QSOs logged at the same time (e.g. merged logs) give infinite rates - skip those
+        ok = np.isfinite(self.rates3)
+        if np.any(ok):
+            print('   Peak smoothed rate:\t%8.1f per hour' % np.max(self.rates3[ok]))
@@ -0,0 +1,84 @@
+############################################################################################
+#
+# station_cache.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Shared cache of resolved stations (country, continent, cq zone, prefix, home call).
+# The same calls show up over and over again in a contest log (band changes, the CWT
+# regulars, etc.) so the cty.dat prefix matching is only done once per unique call.
+# The country data is only loaded the first time a contest actually looks up a call.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+from functools import lru_cache
+from cty_trie import load_cty_trie
+
+############################################################################################
+
+STATION_CACHE_SIZE = 8192
+
+CTY_DIR    = '~/Python/data'
+CTY_TRIE   = None                   # Loaded on first lookup
+CTY_LOADED = False                  # True once dx.load_cty_info has been called
+
+############################################################################################
+
+# Function to set where cty.dat lives - nothing is loaded until its actually needed
+def set_cty_dir(DIR):
+    global CTY_DIR
+    CTY_DIR=DIR
+
+# Function to make sure the dx library has its country info loaded
+def load_dx_cty():
+    global CTY_LOADED
+    if not CTY_LOADED:
+        from dx import load_cty_info
+        load_cty_info(DIR=CTY_DIR)
+        CTY_LOADED=True
+
+# Function to look up a call using the compiled cty trie.
+# Falls back to the dx library if cty.dat can't be found.
+# The objects are shared so don't modify them!
+@lru_cache(maxsize=STATION_CACHE_SIZE)
+def get_station(call):
+    global CTY_TRIE
+    if CTY_TRIE==None:
+        CTY_TRIE=load_cty_trie(CTY_DIR)
+        if CTY_TRIE==None:
+            print('STATION CACHE - cty.dat not found in',CTY_DIR,'- using dx library')
+            CTY_TRIE=False
+    if CTY_TRIE:
+        return CTY_TRIE.lookup(call)
+    return get_dx_station(call)
+
+# Function to look up a call with the dx library itself - for routines that need
+# the full Station object
+@lru_cache(maxsize=STATION_CACHE_SIZE)
+def get_dx_station(call):
+    from dx.spot_processing import Station
+    load_dx_cty()
+    return Station(call)
+
+# Function to print cache statistics - called from the summary of each contest
+def station_cache_report():
+    for name,func in [('Station cache:   ',get_station),
+                      ('DX Station cache:',get_dx_station)]:
+        info  = func.cache_info()
+        total = info.hits+info.misses
+        if total==0:
+            continue
+        print('\n'+name,info.hits,'hits',info.misses,'misses =',
+              int( (100.*info.hits)/total+0.5),'% hit rate\t(',
+              info.currsize,'/',info.maxsize,'calls)')
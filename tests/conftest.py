@@ -0,0 +1,35 @@
+############################################################################################
+#
+# conftest.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# The modules live at the top of the tree - make them importable from the tests.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Function to write a small ADIF log - each QSO is a dict of tags
+def write_adif(fname,qsos,mode='w'):
+    with open(fname,mode,encoding='utf-8') as fp:
+        if mode=='w':
+            fp.write('Test log <eoh>\n')
+        for rec in qsos:
+            for tag,val in rec.items():
+                fp.write('<%s:%d>%s ' % (tag,len(val),val))
+            fp.write('<eor>\n')
@@ -0,0 +1,80 @@
+############################################################################################
+#
+# test_adif_reader.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Tests for the memory-mapped ADIF reader.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import datetime
+from adif_reader import ADIF_READER,adif_epoch,datetime_epoch
+from conftest import write_adif
+
+DATE0 = datetime.datetime(2026,11,28,0,0)
+DATE1 = datetime.datetime(2026,11,29,23,59)
+
+def qso(call,date,time,**kw):
+    rec={'call':call,'qso_date':date,'time_on':time,'band':'20m'}
+    rec.update(kw)
+    return rec
+
+def test_epoch():
+    assert adif_epoch('20261128','1234')==datetime_epoch(datetime.datetime(2026,11,28,12,34))
+    assert adif_epoch('20261128','123456')==adif_epoch('20261128','1234')+56
+    assert adif_epoch('2026XX28','1234')==None
+
+def test_window(tmp_path):
+    fname=str(tmp_path/'log.adi')
+    write_adif(fname,[qso('K1ABC','20261127','2359'),
+                      qso('W1AW','20261128','0001'),
+                      qso('DL1X','20261129','1200'),
+                      qso('JA1Z','20261130','0001')])
+    reader=ADIF_READER(fname,DATE0,DATE1)
+    calls=[rec['call'] for rec in reader]
+    assert calls==['W1AW','DL1X']
+    assert reader.nrecs==4
+    assert reader.nkept==2
+    assert reader.nlate==1
+
+def test_contest_id(tmp_path):
+    fname=str(tmp_path/'log.adi')
+    write_adif(fname,[qso('W1AW','20261128','0001',contest_id='CA-QSO-PARTY'),
+                      qso('DL1X','20261128','0002',contest_id='CQ-WW-CW')])
+    reader=ADIF_READER(fname,DATE0,DATE1,'ca-qso-party')
+    assert [rec['call'] for rec in reader]==['W1AW']
+
+def test_non_ascii(tmp_path):
+    # Length in characters (per the spec) and in bytes (some loggers) both work
+    fname=str(tmp_path/'log.adi')
+    with open(fname,'w',encoding='utf-8') as fp:
+        fp.write('<eoh>\n')
+        fp.write('<call:4>OH2X <name:5>Jäkki <qth:4>Oulu <eor>\n')
+        fp.write('<call:4>OH3Y <name:6>Jäkki <qth:5>Espoo <eor>\n')
+    recs=list( ADIF_READER(fname) )
+    assert [(r['name'],r['qth']) for r in recs]==[('Jäkki','Oulu'),('Jäkki','Espoo')]
+
+def test_skip_to_end(tmp_path):
+    fname=str(tmp_path/'log.adi')
+    write_adif(fname,[qso('W1AW','20261128','0001')])
+    reader=ADIF_READER(fname,DATE0,DATE1)
+    pos=reader.skip_to_end()
+
+    # Only the records appended after pos are returned - a partial record is left for later
+    write_adif(fname,[qso('DL1X','20261128','0002')],'a')
+    with open(fname,'a') as fp:
+        fp.write('<call:4>JA1Z <qso_da')
+    assert [rec['call'] for rec in reader.records(pos)]==['DL1X']
+    assert reader.pos==reader.skip_to_end()
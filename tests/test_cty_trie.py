@@ -0,0 +1,70 @@
+############################################################################################
+#
+# test_cty_trie.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Tests for the cty.dat prefix trie.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+from cty_trie import CTY_TRIE,homecall
+
+CTY = """United States:            05:  08:  NA:   37.53:    91.67:     5.0:  K:
+    AA,K,N,W,=W1AW(5)[8];
+Hawaii:                   31:  61:  OC:   21.12:   157.48:    10.0:  KH6:
+    AH6,KH6,KH7,NH6,WH6;
+Canada:                   05:  09:  NA:   44.35:    78.75:     5.0:  VE:
+    VA,VE,VE1(5)[9],VE7(3)[2];
+Fed. Rep. of Germany:     14:  28:  EU:   51.00:   -10.00:    -1.0:  DL:
+    DA,DB,DC,DL;
+"""
+
+def trie(tmp_path):
+    fname=tmp_path/'cty.dat'
+    fname.write_text(CTY)
+    return CTY_TRIE().build(str(fname))
+
+def test_homecall():
+    assert homecall('KH6/W1AW/P')=='W1AW'
+    assert homecall('dl1abc/qrp')=='DL1ABC'
+
+def test_prefixes(tmp_path):
+    t=trie(tmp_path)
+    assert t.lookup('DL1ABC').country=='Fed. Rep. of Germany'
+    assert t.lookup('KH6XX').country=='Hawaii'
+    assert t.lookup('VE7ABC').cqz==3
+    assert t.lookup('VE3ABC').cqz==5
+    assert t.lookup('VE1ABC').ituz==9
+    assert t.lookup('ZZ9ZZ').country==None
+
+def test_exact(tmp_path):
+    t=trie(tmp_path)
+    st=t.lookup('w1aw')
+    assert st.country=='United States'
+    assert st.ituz==8
+
+def test_portable(tmp_path):
+    t=trie(tmp_path)
+    assert t.lookup('KH6/W1ABC').country=='Hawaii'
+    assert t.lookup('W1ABC/KH6').country=='Hawaii'
+    assert t.lookup('VE3ABC/7').cqz==3
+    assert t.lookup('DL1ABC/P').country=='Fed. Rep. of Germany'
+
+def test_no_country(tmp_path):
+    t=trie(tmp_path)
+    for call in ['W1ABC/MM','DL1ABC/AM']:
+        st=t.lookup(call)
+        assert st.country==None
+        assert st.homecall==call.split('/')[0]
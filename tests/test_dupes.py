@@ -0,0 +1,59 @@
+############################################################################################
+#
+# test_dupes.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Tests for the hash table dupe checker.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import types
+import datetime
+from dupes import DUPE_CHECKER
+
+T0 = datetime.datetime(2026,11,28,0,0)
+
+def qso(call,band,mins,mode='CW'):
+    return {'call':call,'band':band,'mode':mode,'time_stamp':T0+datetime.timedelta(minutes=mins)}
+
+def test_once_per_band():
+    sc=types.SimpleNamespace(nqsos1=0)
+    dupes=DUPE_CHECKER({'key':('call','band')},sc)
+    assert dupes.check(qso('W1AW','20m',0))==(False,False)
+    assert dupes.check(qso('W1AW','40m',5))==(False,False)
+    assert dupes.check(qso('w1aw','20m',10))==(True,False)
+    assert sc.nqsos1==3
+    assert dupes.ndupes==1
+    assert dupes.nrapid==0
+
+def test_rapid():
+    dupes=DUPE_CHECKER({'key':('call','band'),'rapid':2})
+    dupes.check(qso('W1AW','20m',0))
+    assert dupes.check(qso('W1AW','20m',1))==(True,True)
+    assert dupes.check(qso('W1AW','20m',4))==(True,False)
+    assert dupes.nrapid==1
+
+def test_mode():
+    dupes=DUPE_CHECKER({'key':('call','band','mode')})
+    dupes.check(qso('VE3X','20m',0,'CW'))
+    assert dupes.check(qso('VE3X','20m',10,'SSB'))==(False,False)
+    assert dupes.check(qso('VE3X','20m',20,'CW'))==(True,False)
+
+def test_is_dupe():
+    dupes=DUPE_CHECKER({})
+    dupes.check(qso('W1AW','20m',0))
+    assert dupes.is_dupe(qso('W1AW','20m',30))
+    assert not dupes.is_dupe(qso('W1AW','15m',30))
+    assert dupes.ndupes==0
@@ -0,0 +1,62 @@
+############################################################################################
+#
+# test_grids.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Tests for the grid square distances.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import numpy as np
+import pytest
+from grids import GRID_DISTANCES,valid_grid,grid_latlon,distance_stats
+
+def test_valid():
+    for grid in ['FN31','fn31pr','DM12AB34']:
+        assert valid_grid(grid)
+    for grid in ['','FN3','SN31','FN31PR3','FN31ZZ']:
+        assert not valid_grid(grid)
+
+def test_latlon():
+    # Center of the square, sub-square & extended square
+    lat,lon=grid_latlon(['FN31','FN31PR','FN31PR55'])
+    assert np.allclose(lat,[41.5,41.729167,41.731250],atol=1e-4)
+    assert np.allclose(lon,[-73.0,-72.708333,-72.704167],atol=1e-4)
+
+def test_distances():
+    g=GRID_DISTANCES('DM12')
+    assert g.km('DM12')==0
+    assert 3950<g.km('FN31')<4050
+    assert 9300<g.km('JO62')<9500
+    with pytest.raises(ValueError):
+        g.km('XX99')
+
+    kms=g.km_array(['FN31','bad','fn31'])
+    assert kms[0]==kms[2]==g.km('FN31')
+    assert kms[1]==-1
+
+def test_qso_km():
+    g=GRID_DISTANCES('DM12')
+    qsos=[{'grid':'FN31'},{'grid':'JO62'},{'grid':''}]
+    g.fill_qsos(qsos,lambda r: r['grid'])
+    assert g.qso_km(qsos[0],'FN31')==g.km('FN31')
+    assert g.qso_km({'grid':'PM95'},'PM95')==g.km('PM95')
+    with pytest.raises(ValueError):
+        g.qso_km(qsos[2],'')
+
+def test_stats():
+    assert distance_stats([100,3100,2900,9000],3000)[:2]==(9000,15100)
+    assert list(distance_stats([100,3100,2900,9000],3000)[2])==[2,1,0,1]
+    assert distance_stats([],3000)[:2]==(0,0)
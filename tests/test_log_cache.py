@@ -0,0 +1,62 @@
+############################################################################################
+#
+# test_log_cache.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Tests for the on-disk index of ADIF logs.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import os
+import datetime
+from log_cache import CACHED_ADIF_READER,cache_file_name
+from conftest import write_adif
+
+DATE0 = datetime.datetime(2026,11,28,0,0)
+DATE1 = datetime.datetime(2026,11,29,23,59)
+
+def qso(call,time):
+    return {'call':call,'qso_date':'20261128','time_on':time,'band':'20m'}
+
+def read(fname):
+    reader=CACHED_ADIF_READER(fname,DATE0,DATE1)
+    return [rec['call'] for rec in reader],reader.status
+
+def test_cache(tmp_path):
+    fname=str(tmp_path/'log.adi')
+    write_adif(fname,[qso('W1AW','0001'),qso('DL1X','0002')])
+
+    assert read(fname)==(['W1AW','DL1X'],'rebuilt')
+    assert os.path.isfile(cache_file_name(fname))
+    assert read(fname)==(['W1AW','DL1X'],'hit')
+
+    # New records only extend the index
+    write_adif(fname,[qso('JA1Z','0003')],'a')
+    assert read(fname)==(['W1AW','DL1X','JA1Z'],'extended')
+
+def test_edited_log(tmp_path):
+    # Editing a record that was already indexed forces a rebuild
+    fname=str(tmp_path/'log.adi')
+    write_adif(fname,[qso('W1AW','0001'),qso('DL1X','0002')])
+    read(fname)
+    write_adif(fname,[qso('W1AX','0001'),qso('DL1X','0002'),qso('JA1Z','0003')])
+    assert read(fname)==(['W1AX','DL1X','JA1Z'],'rebuilt')
+
+def test_bad_index(tmp_path):
+    fname=str(tmp_path/'log.adi')
+    write_adif(fname,[qso('W1AW','0001')])
+    with open(cache_file_name(fname),'wb') as fp:
+        fp.write(b'junk')
+    assert read(fname)==(['W1AW'],'rebuilt')
@@ -0,0 +1,112 @@
+############################################################################################
+#
+# timestamps.py - Rev 1.0
+# Copyright (C) 2026 by Joseph B. Attili, joe DOT aa2il AT gmail DOT com
+#
+# Batch time stamping of QSOs.  All of the ADIF date/time fields are converted to
+# seconds since 1970 in a single NumPy pass, the contest window is applied as a mask
+# and the Cabrillo date & time strings are formatted once so the scorers don't have
+# to call strptime for every QSO.
+#
+############################################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+############################################################################################
+
+import numpy as np
+from adif_reader import datetime_epoch
+
+############################################################################################
+
+# Function to convert arrays of YYYYMMDD & HHMMSS strings to seconds since 1970
+def epoch_seconds(dates,times):
+
+    d = np.asarray(dates).astype(np.int64)
+    t = np.asarray(times).astype(np.int64)
+
+    years  = (d//10000 - 1970).astype('datetime64[Y]')
+    months = years.astype('datetime64[M]') + (d//100 % 100 - 1)
+    days   = months.astype('datetime64[D]') + (d % 100 - 1)
+
+    secs = (t//10000)*3600 + (t//100 % 100)*60 + t % 100
+    return days.astype(np.int64)*86400 + secs
+
+# Function to pull out the date & time strings of a list of QSOs.
+# Same precedence as before - date/time off if we have it, otherwise date/time on.
+# Records without a date we can read are returned as bad so the caller can deal with them.
+def date_time_strings(qsos):
+
+    dates=[]
+    times=[]
+    bad=[]
+    for i,rec in enumerate(qsos):
+        if 'qso_date_off' in rec:
+            d=rec['qso_date_off']
+            t=rec['time_off']
+        elif 'qso_date' in rec:
+            d=rec['qso_date']
+            t=rec['time_on']
+        else:
+            d=''
+            t=''
+        if len(t)!=6:
+            t=(t+'000000')[:6]
+        if len(d)!=8 or not d.isdigit() or not t.isdigit():
+            bad.append(i)
+            d='19700101'
+            t='000000'
+        dates.append(d)
+        times.append(t)
+
+    return dates,times,bad
+
+# Function to time stamp a list of QSOs.  Returns the array of epoch seconds and
+# the indices of any records that don't have a date.
+def stamp_qsos(qsos):
+    dates,times,bad = date_time_strings(qsos)
+    if len(qsos)==0:
+        return np.zeros(0,dtype=np.int64),bad
+    return epoch_seconds(dates,times),bad
+
+# Function to compute contest window mask - also returns the no. of QSOs after the end
+def window_mask(epochs,date0,date1):
+    t0 = datetime_epoch(date0)
+    t1 = datetime_epoch(date1)
+    late = epochs>t1
+    return (epochs>=t0) & ~late,int( np.count_nonzero(late) )
+
+# Function to attach the time stamp & pre-formatted Cabrillo date/time to each QSO
+def attach_time_stamps(qsos,epochs):
+    if len(qsos)==0:
+        return
+    secs  = np.asarray(epochs).astype('datetime64[s]')
+    stamps = secs.tolist()
+    dates  = np.datetime_as_string(secs,unit='D').tolist()
+    hhmm   = np.datetime_as_string(secs,unit='m').tolist()
+    for rec,ts,d,t in zip(qsos,stamps,dates,hhmm):
+        rec['time_stamp'] = ts
+        rec['cbr_date']   = d                           # YYYY-MM-DD
+        rec['cbr_time']   = t[11:13]+t[14:16]           # HHMM
+
+# Function to get the Cabrillo date (YYYY-MM-DD) & time (HHMM) of a QSO
+def cabrillo_date_time(rec):
+    if 'cbr_date' in rec:
+        return rec['cbr_date'],rec['cbr_time']
+    d=rec['qso_date_off']
+    t=rec['time_off']
+    return d[0:4]+'-'+d[4:6]+'-'+d[6:8],t[0:4]
+
+# Function to get the array of time stamps of a list of QSOs in seconds since 1970
+def qso_epochs(qsos):
+    if len(qsos)==0:
+        return np.zeros(0,dtype=np.int64)
+    return np.array([rec['time_stamp'] for rec in qsos],dtype='datetime64[s]').astype(np.int64)
@@ -23,20 +23,31 @@ import sys
 import datetime
 from rig_io.ft_tables import *
 from scoring import CONTEST_SCORING
+from timestamps import cabrillo_date_time
+from exchanges import EXCHANGE_TRACKER
+from live import LIVE_QUERY
 from dx.spot_processing import Station, Spot, WWV, Comment, ChallengeData
-from pyhamtools.locator import calculate_distance
+from station_cache import get_station,station_cache_report
+from grids import GRID_DISTANCES,distance_stats,valid_grid
 
 ############################################################################################
     
 # Scoring class for WW DIGI contest - Inherits the base contest scoring class
-class WWDIGI_SCORING(CONTEST_SCORING):
+class WWDIGI_SCORING(CONTEST_SCORING,LIVE_QUERY):
  
     def __init__(self,P):
         CONTEST_SCORING.__init__(self,P,'WW-DIGI',mode='DIGI')
         print('WW DIGI Scoring Init')
 
+        # What makes a QSO unique - see dupes.py
+        self.DUPE_RULES = {'key':('call','band')}
+        self.EXCHANGES  = EXCHANGE_TRACKER()
+
         self.MY_CALL = P.SETTINGS['MY_CALL']
         self.MY_GRID = P.SETTINGS['MY_GRID']
+        self.grid_km = GRID_DISTANCES(self.MY_GRID[:4])
+        self.dx_kms  = []                   # Distances & recs for the non-dupes
+        self.dx_recs = []
 
         self.BANDS = ['160m','80m','40m','20m','15m','10m']
         self.band_cnt = np.zeros((len(self.BANDS)),dtype=int)
@@ -93,7 +104,7 @@ class WWDIGI_SCORING(CONTEST_SCORING):
 
         # Pull out relavent entries
         call = rec["call"]
-        freq_khz = int( 1000*float(rec["freq"]) + 0.5 )
+        freq_khz = rec.freq_khz
         band = rec["band"]
 
         grid = rec["gridsquare"]
@@ -108,36 +119,34 @@ class WWDIGI_SCORING(CONTEST_SCORING):
 
         #print('call=',call)
         
-        dx_station = Station(call)
-        date_off = datetime.datetime.strptime( rec["qso_date_off"] , "%Y%m%d").strftime('%Y-%m-%d')
-        time_off = datetime.datetime.strptime( rec["time_off"] , '%H%M%S').strftime('%H%M')
-
-        # Compute score for this entry
-        dx_km = int( calculate_distance(grid,self.MY_GRID[:4]) +0.5 )
+        dx_station = get_station(call)
+        date_off,time_off = cabrillo_date_time(rec)
+
+        # Compute score for this entry - the distances to all of the grids in the log
+        # are computed in one shot the first time through
+        if self.grid_km.qso_kms is None:
+            self.grid_km.fill_qsos(qsos,lambda r: r.get('gridsquare',''))
+        dx_km = self.grid_km.qso_km(rec,grid)
         qso_points = 1+int(dx_km/3000.)
-        if dx_km > self.max_km:
-            self.max_km=dx_km
-            self.longest=rec
             
         self.Qs.append([call,grid,dx_km,qso_points])
             
         self.nqsos+=1
         if not dupe:
-            self.total_km += dx_km
+            self.dx_kms.append(dx_km)
+            self.dx_recs.append(rec)
             self.nqsos2 += 1;
             self.total_points += qso_points
 
             self.NQSOS[band] +=1
             idx2 = self.BANDS.index(band)
             self.band_cnt[idx2] += 1
-            self.dxccs.append(dx_station.country)
+            if dx_station.country:
+                self.dxccs.append(dx_station.country)
 
             # Info for multi-qsos
             exch_in=grid
-            if call in self.EXCHANGES.keys():
-                self.EXCHANGES[call].append(exch_in)
-            else:
-                self.EXCHANGES[call]=[exch_in]
+            self.EXCHANGES.add(call,exch_in)
             
 #                              ------info sent------- ------info rcvd-------
 #QSO: freq  mo date       time call          exch     call          exch        t
@@ -153,6 +162,24 @@ class WWDIGI_SCORING(CONTEST_SCORING):
         return line
 
 
+    # What a QSO would be worth - see live.py.  exch is the grid - if not given,
+    # we go by what we got last time.
+    def qso_value(self,band,call,exch=None):
+        grid = exch or self.last_exchange(call)
+        if not grid or not valid_grid(grid):
+            return 0,[]
+        grid  = grid[:4].upper()
+        field = grid[:2]
+        qso_points = 1+int(self.grid_km.km(grid)/3000.)
+        new_mults=[]
+        if field not in self.grid_fields[band]:
+            new_mults.append(field)
+        return qso_points,new_mults
+
+    # Total points & mults so far
+    def score_totals(self):
+        return self.total_points,sum([len(self.grid_fields[b]) for b in self.BANDS])
+
     # Summary & final tally
     def summary(self):
 
@@ -164,10 +191,18 @@ class WWDIGI_SCORING(CONTEST_SCORING):
         print('\nNo. unique DXCCs =',len(dxccs))
         print(dxccs)
         
+        # Distance stats for the whole log in one shot
+        self.max_km,self.total_km,buckets = distance_stats(self.dx_kms,3000)
+        if len(self.dx_kms)>0:
+            self.longest = self.dx_recs[ int(np.argmax(self.dx_kms)) ]
         avg_dx_km = self.total_km / self.nqsos2
         print('\nLongest DX:',self.max_km,'km')
         print(self.longest)
         print('\nAverage DX:',avg_dx_km,'km')
+
+        print('\nDistance (km)\tQSO Points\t# QSOs')
+        for i in range(len(buckets)):
+            print('%5d - %5d\t%5d\t\t%5d' % (3000*i,3000*(i+1),i+1,buckets[i]))
         
         #print 'GRID FIELDS:',sc.grid_fields
         print('\nBand\t# QSOs\t# Fields\tGrid Fields')
@@ -188,3 +223,4 @@ class WWDIGI_SCORING(CONTEST_SCORING):
         print('Multipliers   =',mults)
         print('Claimed Score =',self.total_points*mults)
 
+        station_cache_report()